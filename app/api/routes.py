@@ -1,22 +1,183 @@
+import asyncio
+import itertools
+import json
+import secrets
+import time
+from typing import Optional
 from fastapi import Request, HTTPException, APIRouter
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pathlib import Path
-from starlette.responses import StreamingResponse
-from app.services.news_fetcher_service import news_fetcher
-from app.services.openai_client import OpenAIClient
-from app.services.audio_generator import AudioGenerator
-from app.utils.logger import get_logger
-from starlette.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse, StreamingResponse
+from app.services.news_fetcher_service import get_news_fetcher
+from app.services.refresh_scheduler import get_refresh_scheduler
+from app.models.NewsArticle import to_api_json
+from app.config import settings
+from app.utils import metrics
+from app.utils.logger import get_logger, HOT_PATH
 
 logger = get_logger(__name__)
 router = APIRouter()
 
-# Initialize services
-openai_client = OpenAIClient()
-audio_generator = AudioGenerator()
+# Services are built on first use, so importing the app stays cheap and a cold
+# start only pays for what its first requests actually need.
+_services = {}
 
-# Jinja2 Templates
-templates = Jinja2Templates(directory="app/api/templates")
+def _service(name, factory):
+    service = _services.get(name)
+    if service is None:
+        service = _services[name] = factory()
+    return service
+
+def get_audio_generator():
+    from app.services.audio_generator import AudioGenerator
+    return _service('audio_generator', AudioGenerator)
+
+def _listening(service):
+    # Snapshot listeners are called with the current articles right away
+    get_news_fetcher().add_snapshot_listener(service.update_source)
+    return service
+
+def get_search_index():
+    from app.services.search_index import SearchIndex
+    return _service('search_index', lambda: _listening(SearchIndex()))
+
+def get_vocabulary_index():
+    from app.services.learning_content import VocabularyIndex
+    return _service('vocabulary_index', lambda: _listening(VocabularyIndex()))
+
+def get_image_cache(prefetch=None):
+    # `prefetch` only applies to the first call, which builds the cache (startup, on IMAGE_PREFETCH)
+    from app.services.image_cache import ImageCache
+    return _service('image_cache', lambda: _listening(ImageCache(
+        settings.IMAGE_CACHE_DIR, settings.IMAGE_CACHE_MAX_BYTES, settings.IMAGE_THUMBNAIL_SIZES, prefetch=prefetch
+    )))
+
+def get_change_log():
+    from app.services.article_changes import ChangeLog
+    return _service('change_log', ChangeLog)
+
+def get_templates():
+    from starlette.templating import Jinja2Templates
+    return _service('templates', lambda: Jinja2Templates(directory="app/api/templates"))
+
+def get_source_articles(source: Optional[str]):
+    news_fetcher = get_news_fetcher()
+    if source is not None and source not in news_fetcher.sources():
+        raise HTTPException(status_code=404, detail=f"Unknown source: {source}")
+    return news_fetcher.get_source_articles(source)
+
+_article_positions = {}  # source filter -> (articles list, {url: article_id})
+
+def article_positions(source, articles):
+    """
+    Maps article URLs to their ids in the given list, rebuilt only when the list changes.
+    """
+    cached = _article_positions.get(source)
+    if cached is None or cached[0] is not articles:
+        cached = (articles, {article.get('url'): index for index, article in enumerate(articles)})
+        _article_positions[source] = cached
+    return cached[1]
+
+_articles_payloads = {}  # source filter -> (articles list, encoded /api/articles body)
+
+def articles_payload(source, articles):
+    """
+    Encodes the article list once per snapshot instead of on every request.
+    """
+    cached = _articles_payloads.get(source)
+    if cached is None or cached[0] is not articles:
+        version = get_change_log().version(source, articles)
+        cached = (articles, encode_json({"version": version, "articles": articles}))
+        _articles_payloads[source] = cached
+    return cached[1]
+
+_changes_payloads = {}  # source filter -> (articles list, {since: encoded /api/articles/changes body})
+
+def changes_payload(source, articles, since):
+    """
+    Encodes what changed in the article list since version `since`, or the whole
+    list with "full_resync" when `since` is unknown or too old. Only the changed
+    records are encoded, once per (snapshot, since) pair.
+    """
+    cached = _changes_payloads.get(source)
+    if cached is None or cached[0] is not articles:
+        cached = (articles, {})
+        _changes_payloads[source] = cached
+    payloads = cached[1]
+    if since in payloads:
+        return payloads[since]
+
+    version, changes = get_change_log().changes(source, articles, since)
+    if changes is None:
+        # Unknown versions all share one full resync body, so the cache stays bounded by the history size
+        if None not in payloads:
+            payloads[None] = encode_json({"version": version, "full_resync": True, "articles": articles})
+        return payloads[None]
+    payloads[since] = encode_json({
+        "version": version,
+        "full_resync": False,
+        "added": [{**articles[index].to_api_dict(), "article_id": index} for index in changes['added']],
+        "updated": [{**articles[index].to_api_dict(), "article_id": index} for index in changes['updated']],
+        "removed": changes['removed'],
+        "moved": changes['moved'],
+    })
+    return payloads[since]
+
+def encode_json(body):
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":"), default=to_api_json).encode('utf-8')
+
+# Fields the HTML templates show; bodies stay in the body store
+TEMPLATE_FIELDS = ('title', 'adapted_title', 'published_date', 'teaser', 'adapted_teaser', 'image_url', 'url', 'source')
+
+def template_article(article):
+    """
+    Plain dict of an article's set template fields. Jinja renders a missing dict
+    key as empty, but reads an unset record field through its slot as None.
+    """
+    return {key: article.get(key) for key in TEMPLATE_FIELDS if key in article}
+
+def read_chunks(audio_content, chunk_size=64 * 1024):
+    while True:
+        chunk = audio_content.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+class TTSStreamingResponse(StreamingResponse):
+    """
+    Audio stream that keeps the in-flight TTS gauge up until the response is over,
+    whether it finished, failed, or the client left before the body started.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            metrics.TTS_STREAMS_IN_FLIGHT.dec()
+
+def stable_voice_key(data, text):
+    """
+    Long-form voices are keyed by the article (when the client names it) or else
+    by the first paragraph, so edits further down keep the narrator. An unknown
+    or stale source falls back to the paragraph key instead of failing playback.
+    """
+    article_id = data.get('article_id')
+    if isinstance(article_id, int):
+        try:
+            articles = get_source_articles(data.get('source'))
+        except HTTPException:
+            articles = []
+        if 0 <= article_id < len(articles) and articles[article_id].get('url'):
+            return articles[article_id]['url']
+    return text.strip().split('\n', 1)[0]
+
+def snapshot_ages():
+    now = time.time()
+    return {(source,): now - fetcher.last_updated
+            for source, fetcher in get_news_fetcher().source_fetchers().items() if fetcher.last_updated}
+
+metrics.SNAPSHOT_AGE.set_function(snapshot_ages)
 
 # HTML Routes for Web Interface
 @router.get("/health")
@@ -25,12 +186,16 @@ async def health_check():
 
 @router.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    news_articles = news_fetcher.get_cached_articles()
-    logger.info("Rendering index page")
-    return templates.TemplateResponse("news.html", {"request": request, "articles": enumerate(news_articles)})
+    news_articles = get_news_fetcher().get_cached_articles()
+    logger.info("Rendering index page", extra=HOT_PATH)
+    return get_templates().TemplateResponse("news.html", {
+        "request": request,
+        "articles": enumerate(template_article(article) for article in news_articles),
+    })
 
 @router.get("/article/{article_id}", response_class=HTMLResponse)
 async def article_detail(request: Request, article_id: int):
+    news_fetcher = get_news_fetcher()
     articles = news_fetcher.get_cached_articles()
     if 0 <= article_id < len(articles):
         article = articles[article_id]
@@ -41,11 +206,11 @@ async def article_detail(request: Request, article_id: int):
         # Format the adapted teaser for display
         formatted_adapted_teaser = news_fetcher.format_article_text(adapted_teaser) if adapted_teaser else ''
 
-        return templates.TemplateResponse(
+        return get_templates().TemplateResponse(
             "news_detail.html",
             {
                 "request": request,
-                "article": article,
+                "article": template_article(article),
                 "formatted_adapted_text": formatted_adapted_teaser,
                 "article_id": article_id,
             }
@@ -55,14 +220,24 @@ async def article_detail(request: Request, article_id: int):
 
 # API Routes for Android App
 @router.get("/api/articles")
-async def get_articles():
-    news_articles = news_fetcher.get_cached_articles()
-    logger.info("Returning news articles as JSON")
-    return {"articles": news_articles}
+async def get_articles(source: Optional[str] = None):
+    news_articles = get_source_articles(source)
+    logger.info("Returning news articles as JSON", extra=HOT_PATH)
+    return Response(content=articles_payload(source, news_articles), media_type="application/json")
+
+@router.get("/api/articles/changes")
+async def get_article_changes(since: Optional[int] = None, source: Optional[str] = None):
+    """
+    Delta sync: the articles added, updated, removed or moved since the `version`
+    of an earlier /api/articles or /api/articles/changes response. See
+    ChangeLog.changes for how a client rebuilds the article order.
+    """
+    news_articles = get_source_articles(source)
+    return Response(content=changes_payload(source, news_articles, since), media_type="application/json")
 
 @router.get("/api/article/{article_id}")
-async def get_article_detail(article_id: int):
-    articles = news_fetcher.get_cached_articles()
+async def get_article_detail(article_id: int, source: Optional[str] = None):
+    articles = get_source_articles(source)
     if 0 <= article_id < len(articles):
         article = articles[article_id]
 
@@ -70,16 +245,89 @@ async def get_article_detail(article_id: int):
         adapted_teaser = article.get('adapted_teaser', '')
 
         # Format the adapted teaser
-        formatted_adapted_teaser = news_fetcher.format_article_text(adapted_teaser) if adapted_teaser else ''
+        formatted_adapted_teaser = get_news_fetcher().format_article_text(adapted_teaser) if adapted_teaser else ''
 
         return {
-            "article": article,
+            "article": article.to_api_dict(),
             "formatted_adapted_text": formatted_adapted_teaser,
             "article_id": article_id,
         }
     else:
         raise HTTPException(status_code=404, detail="Article not found")
 
+@router.get("/api/search")
+async def search_articles(q: str, limit: int = 20, source: Optional[str] = None):
+    articles = get_source_articles(source)
+    positions = article_positions(source, articles)
+    results = []
+    for url, score in get_search_index().search(q, limit=max(1, min(limit, 100)), source=source):
+        article_id = positions.get(url)
+        if article_id is not None:
+            results.append({"article_id": article_id, "score": round(score, 4), "article": articles[article_id].to_api_dict()})
+    return {"query": q, "results": results}
+
+def get_learning_content(article_id: int, level: str, source: Optional[str]):
+    articles = get_source_articles(source)
+    if not 0 <= article_id < len(articles):
+        raise HTTPException(status_code=404, detail="Article not found")
+    content = (articles[article_id].get('learning') or {}).get(level)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Learning content not available for level {level}")
+    return content
+
+@router.get("/api/article/{article_id}/vocabulary")
+async def get_article_vocabulary(article_id: int, level: str = 'A1', source: Optional[str] = None):
+    content = get_learning_content(article_id, level, source)
+    return {"article_id": article_id, "level": level, "vocabulary": content['vocabulary']}
+
+@router.get("/api/article/{article_id}/questions")
+async def get_article_questions(article_id: int, level: str = 'A1', source: Optional[str] = None):
+    content = get_learning_content(article_id, level, source)
+    return {"article_id": article_id, "level": level, "questions": content['questions']}
+
+@router.get("/api/vocabulary/new")
+async def get_new_vocabulary(days: int = 7, limit: int = 20, source: Optional[str] = None):
+    get_source_articles(source)  # Validates the source filter
+    return {"days": days, "words": get_vocabulary_index().new_words(days=days, limit=max(1, min(limit, 200)), source=source)}
+
+@router.get("/api/vocabulary/{lemma}/articles")
+async def get_vocabulary_articles(lemma: str, source: Optional[str] = None):
+    articles = get_source_articles(source)
+    positions = article_positions(source, articles)
+    results = []
+    for url, entry in get_vocabulary_index().articles_with(lemma, source=source).items():
+        article_id = positions.get(url)
+        if article_id is not None:
+            results.append({"article_id": article_id, "entry": entry, "article": articles[article_id].to_api_dict()})
+    results.sort(key=lambda result: result["article_id"])
+    return {"lemma": lemma, "results": results}
+
+@router.get("/api/image/{article_id}")
+async def get_article_image(article_id: int, size: str = 'small', v: Optional[str] = None,
+                            source: Optional[str] = None):
+    if size not in settings.IMAGE_THUMBNAIL_SIZES:
+        raise HTTPException(status_code=400, detail=f"Unknown size: {size}")
+
+    # With the article's image_key as `v`, the URL names one exact image and can be cached forever;
+    # without it, the id may point at a different image after the next refresh.
+    image_cache = get_image_cache()
+    image_url = image_cache.url_for_key(v) if v else None
+    immutable = image_url is not None
+    if image_url is None:
+        articles = get_source_articles(source)
+        if not 0 <= article_id < len(articles):
+            raise HTTPException(status_code=404, detail="Article not found")
+        image_url = articles[article_id].get('image_url')
+        if not image_url:
+            raise HTTPException(status_code=404, detail="Article has no image")
+
+    cached = await run_in_threadpool(image_cache.get, image_url, size)
+    if cached is None:
+        raise HTTPException(status_code=502, detail="Image could not be fetched")
+    path, content_type = cached
+    cache_control = "public, max-age=31536000, immutable" if immutable else "public, max-age=300"
+    return FileResponse(path, media_type=content_type, headers={"Cache-Control": cache_control})
+
 @router.post("/api/article/{article_id}/adapt")
 async def adapt_article_text_api(article_id: int, request: Request):
     data = await request.json()
@@ -88,15 +336,18 @@ async def adapt_article_text_api(article_id: int, request: Request):
     if not level:
         return JSONResponse({'status': 'error', 'message': 'Level not specified'}, status_code=400)
 
+    news_fetcher = get_news_fetcher()
     news_articles = news_fetcher.get_cached_articles()
     if 0 <= article_id < len(news_articles):
         article = news_articles[article_id]
         # Since we're no longer adapting text on demand, check if the level matches
         if level == 'A1':
+            metrics.ADAPTATION_CACHE.inc(result='hit')
             adapted_teaser = article.get('adapted_teaser', '')
             formatted_adapted_teaser = news_fetcher.format_article_text(adapted_teaser) if adapted_teaser else ''
             return {'status': 'success', 'adapted_text': formatted_adapted_teaser}
         else:
+            metrics.ADAPTATION_CACHE.inc(result='miss')
             return JSONResponse(
                 {'status': 'error', 'message': f'Adapted text not available for level {level}'},
                 status_code=404
@@ -108,18 +359,37 @@ async def adapt_article_text_api(article_id: int, request: Request):
 async def generate_audio_endpoint_api(request: Request):
     data = await request.json()
     text = data.get('text', '')
-    voice = data.get('voice', audio_generator.get_random_voice())
+    audio_generator = get_audio_generator()
 
     if not text:
         return JSONResponse({'status': 'error', 'message': 'Text not provided'}, status_code=400)
 
+    long_form = audio_generator.is_long_form(text)
+    if long_form:
+        # Optional `article_id`/`source` keep one narrator per article across edits
+        voice = data.get('voice') or audio_generator.get_stable_voice(stable_voice_key(data, text))
+    else:
+        voice = data.get('voice', audio_generator.get_random_voice())
+
     # Generate audio content
     logger.info("Generating audio for provided text.")
-    audio_content = audio_generator.generate_audio(text, voice)
+    metrics.TTS_STREAMS_IN_FLIGHT.inc()
+    try:
+        if long_form:
+            # Segments are synthesized concurrently; respond as soon as the first one is ready
+            segments = audio_generator.generate_audio_segments(text, voice)
+            first_segment = await run_in_threadpool(next, segments, None)
+            audio_content = itertools.chain([first_segment], segments) if first_segment else None
+        else:
+            audio_content = await run_in_threadpool(audio_generator.generate_audio, text, voice)
+            audio_content = read_chunks(audio_content) if audio_content else None
+    except Exception:
+        metrics.TTS_STREAMS_IN_FLIGHT.dec()
+        raise
 
     if audio_content:
         logger.info("Audio content generated successfully.")
-        return StreamingResponse(
+        return TTSStreamingResponse(
             content=audio_content,
             media_type="audio/mpeg",
             headers={
@@ -127,5 +397,61 @@ async def generate_audio_endpoint_api(request: Request):
             }
         )
     else:
+        metrics.TTS_STREAMS_IN_FLIGHT.dec()
         logger.error("Failed to generate audio")
-        return JSONResponse({'status': 'error', 'message': 'Audio generation failed'}, status_code=500)
\ No newline at end of file
+        return JSONResponse({'status': 'error', 'message': 'Audio generation failed'}, status_code=500)
+
+# Admin API: refresh status, manual trigger and progress stream
+def require_admin(request: Request):
+    token = settings.ADMIN_TOKEN
+    supplied = request.headers.get('Authorization', '')
+    if not token or not secrets.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+        raise HTTPException(status_code=403, detail="Admin access denied")
+
+def get_admin_scheduler(source: Optional[str]):
+    scheduler = get_refresh_scheduler()
+    if scheduler is None:
+        raise HTTPException(status_code=409, detail="This instance does not run the refresh scheduler")
+    if source is not None and source not in scheduler.schedules:
+        raise HTTPException(status_code=404, detail=f"Unknown source: {source}")
+    return scheduler
+
+async def refresh_progress_events(runs, poll_seconds=0.5):
+    """
+    Server-sent events with the counters of each run whenever they change, until all runs finish.
+    """
+    revisions = [None] * len(runs)
+    while True:
+        for index, run in enumerate(runs):
+            if revisions[index] != run.revision:
+                revisions[index] = run.revision
+                yield f"event: progress\ndata: {json.dumps(run.to_dict())}\n\n"
+        if not any(run.running for run in runs):
+            break
+        await asyncio.sleep(poll_seconds)
+    yield "event: done\ndata: {}\n\n"
+
+def refresh_progress_response(runs):
+    return StreamingResponse(refresh_progress_events(runs), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@router.get("/api/admin/refresh")
+async def get_refresh_status(request: Request):
+    require_admin(request)
+    return {"sources": get_admin_scheduler(None).status()}
+
+@router.post("/api/admin/refresh")
+async def trigger_refresh(request: Request, source: Optional[str] = None, stream: bool = False):
+    require_admin(request)
+    scheduler = get_admin_scheduler(source)
+    # Sources that are already refreshing are not started again; their running refresh is reported
+    runs = scheduler.trigger([source] if source else None)
+    if stream:
+        return refresh_progress_response(runs)
+    return JSONResponse({"runs": [run.to_dict() for run in runs]}, status_code=202)
+
+@router.get("/api/admin/refresh/progress")
+async def stream_refresh_progress(request: Request, source: Optional[str] = None):
+    require_admin(request)
+    scheduler = get_admin_scheduler(source)
+    return refresh_progress_response(scheduler.progress([source] if source else None))
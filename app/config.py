@@ -14,10 +14,66 @@ from pathlib import Path
 class Settings:
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     WEB_APP_PREFIX = '/app'  # Or your desired prefix
-    NEWS_JSON_PATH = Path('news_articles.json')
-    NEWS_JSON_PATH_DW = Path('news_articles_dw.json')  # Separate cache for DW news
+    NEWS_JSON_PATH = Path(os.getenv('NEWS_JSON_PATH', 'news_articles.json'))
+    NEWS_JSON_PATH_DW = Path(os.getenv('NEWS_JSON_PATH_DW', 'news_articles_dw.json'))  # Separate cache for DW news
+    # Upstream endpoints; overridden by the benchmark harness to point at local stubs
+    NBA_NEWS_URL = os.getenv('NBA_NEWS_URL', 'https://www.slamdunk.ru/news/nba/')
+    DW_BASE_URL = os.getenv('DW_BASE_URL', 'https://www.dw.com')
+    DW_NEWS_URL = os.getenv('DW_NEWS_URL', DW_BASE_URL + '/de/themen/s-9077')
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
     PORT = int(os.getenv('PORT', 8080))
-    NEWS_FETCHER = os.getenv('NEWS_FETCHER', 'nba')  # 'nba' or 'dw'
+    NEWS_FETCHER = os.getenv('NEWS_FETCHER', 'nba')  # 'nba', 'dw', 'all' or a comma-separated list such as 'nba,dw'
+    NEWS_REFRESH_HOURS = {  # Refresh interval per source
+        'nba': float(os.getenv('NBA_REFRESH_HOURS', 5)),
+        'dw': float(os.getenv('DW_REFRESH_HOURS', 5)),
+    }
+    # The refresh scheduler adapts each interval to how often the source publishes
+    REFRESH_MIN_MINUTES = float(os.getenv('REFRESH_MIN_MINUTES', 30))
+    REFRESH_MAX_HOURS = float(os.getenv('REFRESH_MAX_HOURS', 12))
+    REFRESH_TARGET_NEW_ARTICLES = float(os.getenv('REFRESH_TARGET_NEW_ARTICLES', 5))  # New articles per run to aim for
+    REFRESH_JITTER = float(os.getenv('REFRESH_JITTER', 0.1))  # Random spread of each delay, as a fraction
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')  # Bearer token for /api/admin endpoints; unset disables them
+    # Texts longer than ADAPTATION_CHUNK_TOKENS are adapted in chunks, ADAPTATION_WORKERS at a time
+    ADAPTATION_CHUNK_TOKENS = int(os.getenv('ADAPTATION_CHUNK_TOKENS', 800))
+    ADAPTATION_OVERLAP_TOKENS = int(os.getenv('ADAPTATION_OVERLAP_TOKENS', 120))  # Preceding context sent with each chunk
+    ADAPTATION_WORKERS = int(os.getenv('ADAPTATION_WORKERS', 4))
+    # Vocabulary lists and comprehension questions precomputed during refresh
+    LEARNING_CONTENT_ENABLED = os.getenv('LEARNING_CONTENT_ENABLED', 'true').lower() == 'true'
+    LEARNING_LEVELS = [level.strip() for level in os.getenv('LEARNING_LEVELS', 'A1').split(',') if level.strip()]
+    LEARNING_WORKERS = int(os.getenv('LEARNING_WORKERS', 4))  # Concurrent LLM calls while precomputing
+    # Article bodies longer than BODY_INLINE_LIMIT characters are kept on disk, not in memory
+    BODY_STORE_DIR = Path(os.getenv('BODY_STORE_DIR', '.bodies'))
+    BODY_INLINE_LIMIT = int(os.getenv('BODY_INLINE_LIMIT', 1024))
+    BODY_PRUNE_GRACE_SECONDS = int(os.getenv('BODY_PRUNE_GRACE_SECONDS', 600))  # Before unreferenced bodies are deleted
+    # Image proxy: resized thumbnails of article images, cached on disk
+    IMAGE_CACHE_DIR = Path(os.getenv('IMAGE_CACHE_DIR', '.image_cache'))
+    IMAGE_CACHE_MAX_BYTES = int(os.getenv('IMAGE_CACHE_MAX_MB', 200)) * 1024 * 1024
+    IMAGE_THUMBNAIL_SIZES = {'small': 320, 'medium': 720}  # size name -> max width in pixels
+    IMAGE_MAX_SOURCE_BYTES = int(os.getenv('IMAGE_MAX_SOURCE_MB', 10)) * 1024 * 1024  # Larger source images are refused
+    IMAGE_PREFETCH = os.getenv('IMAGE_PREFETCH', 'true').lower() == 'true'  # Fetch new images at refresh time, on the leader
+    # Long-form TTS: texts over TTS_SEGMENT_CHARS are synthesized in cached segments, TTS_WORKERS at a time
+    TTS_SEGMENT_CHARS = int(os.getenv('TTS_SEGMENT_CHARS', 600))
+    TTS_WORKERS = int(os.getenv('TTS_WORKERS', 4))
+    TTS_CACHE_DIR = Path(os.getenv('TTS_CACHE_DIR', '.tts_cache'))
+    TTS_CACHE_MAX_BYTES = int(os.getenv('TTS_CACHE_MAX_MB', 500)) * 1024 * 1024
+    # Near-duplicate articles (SimHash of title and teaser) are collapsed at refresh time
+    DUPLICATE_INDEX_DIR = Path(os.getenv('DUPLICATE_INDEX_DIR', '.duplicates'))
+    DUPLICATE_MAX_DISTANCE = int(os.getenv('DUPLICATE_MAX_DISTANCE', 8))  # Differing bits out of 64
+    DUPLICATE_MAX_ADAPTATIONS = int(os.getenv('DUPLICATE_MAX_ADAPTATIONS', 1000))  # Adaptations kept for reuse
+    DUPLICATE_TTL_DAYS = int(os.getenv('DUPLICATE_TTL_DAYS', 30))  # Forget articles not seen for this long
+    # Delta sync: /api/articles/changes can answer from the last CHANGES_HISTORY versions of each feed
+    CHANGES_HISTORY = int(os.getenv('CHANGES_HISTORY', 20))
+    # Multi-instance mode: set SNAPSHOT_DIR to a directory shared by all instances
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR')
+    SNAPSHOT_KEEP = int(os.getenv('SNAPSHOT_KEEP', 5))  # Snapshot versions kept in the store
+    SNAPSHOT_POLL_SECONDS = int(os.getenv('SNAPSHOT_POLL_SECONDS', 15))  # How often instances check for new versions
+    LEADER_LEASE = os.getenv('LEADER_LEASE', 'sqlite')  # 'sqlite' or 'file'
+    LEADER_LEASE_TTL = int(os.getenv('LEADER_LEASE_TTL', 60))  # Seconds before an unrenewed lease expires
+    # Without SNAPSHOT_DIR, the workers on one machine elect a leader and share a memory-mapped snapshot
+    WORKERS = int(os.getenv('WEB_CONCURRENCY', 1))
+    WORKER_SNAPSHOT_DIR = Path(os.getenv('WORKER_SNAPSHOT_DIR', '.snapshots'))
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')  # Add this line with a default value
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+    LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', 100))  # Keep 1 in N repetitive hot-path messages
 
 settings = Settings()
\ No newline at end of file
@@ -1,13 +1,189 @@
 # app/models/news.py
-from dataclasses import dataclass, field
+import sys
 from typing import Optional, Dict
 
-@dataclass
+# Fields in the order they are serialised, matching the cached JSON files
+FIELDS = (
+    'title', 'short_title', 'adapted_title', 'published_date', 'teaser', 'adapted_teaser', 'text',
+    'image_url', 'url', 'adapted_texts', 'source', 'image_key', 'learning',
+)
+# Short, highly repetitive values shared by every article of a snapshot
+INTERNED_FIELDS = ('published_date', 'source')
+# Fields whose large values are kept in the body store instead of in memory
+BODY_FIELDS = ('text',)
+# Fields served only by their own endpoints, never in article listings
+DETAIL_FIELDS = ('learning',)
+
+
+class BodyRef:
+    """
+    Reference to a text kept in the body store; resolved on attribute access.
+    """
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+
 class NewsArticle:
-    title: str
-    short_title: str
-    teaser: Optional[str]
-    published_date: str
-    text: str
-    url: str
-    adapted_texts: Dict[str, str] = field(default_factory=dict)
\ No newline at end of file
+    """
+    Compact, immutable article record.
+
+    Reads like the article dicts it replaces (`article['title']`, `article.get('teaser', '')`)
+    so templates and services keep working, but uses __slots__ instead of a per-instance
+    dict, interns repeated values, splits `image_url` into a shared prefix and a suffix,
+    and keeps large bodies in a BodyStore, loading them only when read.
+
+    Fields that are absent are stored as None and behave like missing dict keys.
+    Use `replace()` to derive a changed copy.
+    """
+    __slots__ = (
+        'title', 'short_title', 'adapted_title', 'published_date', 'teaser', 'adapted_teaser', '_text',
+        '_image_prefix', '_image_suffix', 'url', '_adapted_texts', 'source', 'image_key', 'learning',
+        'extra', '_body_store',
+    )
+
+    def __init__(self, title: str, url: str, published_date: Optional[str] = None, teaser: Optional[str] = None,
+                 text: Optional[str] = None, short_title: Optional[str] = None, adapted_title: Optional[str] = None,
+                 adapted_teaser: Optional[str] = None, image_url: Optional[str] = None,
+                 adapted_texts: Optional[Dict[str, str]] = None, source: Optional[str] = None,
+                 image_key: Optional[str] = None, learning: Optional[dict] = None, extra: Optional[dict] = None,
+                 body_store=None):
+        init = object.__setattr__
+        init(self, '_body_store', body_store)
+        init(self, 'title', title)
+        init(self, 'short_title', short_title)
+        init(self, 'adapted_title', adapted_title)
+        init(self, 'published_date', _intern(published_date))
+        init(self, 'teaser', teaser)
+        init(self, 'adapted_teaser', adapted_teaser)
+        init(self, '_text', self._store_body(text))
+        prefix, suffix = _split_url(image_url)
+        init(self, '_image_prefix', prefix)
+        init(self, '_image_suffix', suffix)
+        init(self, 'url', url)
+        init(self, '_adapted_texts', tuple(
+            (sys.intern(level), self._store_body(value)) for level, value in (adapted_texts or {}).items()
+        ) or None)
+        init(self, 'source', _intern(source))
+        init(self, 'image_key', image_key)
+        init(self, 'learning', learning or None)
+        init(self, 'extra', extra or None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"NewsArticle is immutable; use replace() to change {name!r}")
+
+    def _store_body(self, value):
+        if value is None or self._body_store is None:
+            return value
+        return self._body_store.put(value)
+
+    def _load_body(self, value):
+        if isinstance(value, BodyRef):
+            return self._body_store.get(value.key)
+        return value
+
+    @property
+    def text(self):
+        return self._load_body(self._text)
+
+    @property
+    def image_url(self):
+        if self._image_suffix is None:
+            return None
+        return (self._image_prefix or '') + self._image_suffix
+
+    @property
+    def adapted_texts(self):
+        return {level: self._load_body(value) for level, value in self._adapted_texts or ()}
+
+    def body_keys(self):
+        """
+        Returns the keys of the bodies this record keeps in the body store.
+        """
+        values = [self._text] + [value for _, value in self._adapted_texts or ()]
+        return [value.key for value in values if isinstance(value, BodyRef)]
+
+    @classmethod
+    def from_dict(cls, data, body_store=None):
+        known = {key: data[key] for key in FIELDS if key in data}
+        extra = {key: value for key, value in data.items() if key not in known}
+        return cls(**known, extra=extra, body_store=body_store)
+
+    def to_dict(self):
+        data = {}
+        for key in FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_api_dict(self):
+        """
+        The article as the API lists it, without the fields in DETAIL_FIELDS.
+        """
+        data = self.to_dict()
+        for key in DETAIL_FIELDS:
+            data.pop(key, None)
+        return data
+
+    def replace(self, **changes):
+        data = self.to_dict()
+        data.update(changes)
+        return NewsArticle.from_dict(data, body_store=self._body_store)
+
+    # Read-only mapping interface, so records can be used where article dicts were
+    def get(self, key, default=None):
+        if key in FIELDS:
+            value = getattr(self, key)
+        elif self.extra:
+            value = self.extra.get(key)
+        else:
+            value = None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def __repr__(self):
+        return f"NewsArticle(source={self.source!r}, url={self.url!r}, title={self.title!r})"
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _split_url(url):
+    if not url:
+        return None, url
+    cut = url.rfind('/') + 1
+    return (sys.intern(url[:cut]) if cut else None), url[cut:]
+
+
+def to_json(value):
+    """
+    `default=` hook for json.dump(s) so lists of records serialise like lists of dicts.
+    """
+    if isinstance(value, NewsArticle):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_api_json(value):
+    """
+    Like `to_json`, but serialises records as the API lists them (`to_api_dict`).
+    """
+    if isinstance(value, NewsArticle):
+        return value.to_api_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
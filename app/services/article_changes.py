@@ -0,0 +1,145 @@
+# app/services/article_changes.py
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from app.config import settings
+
+# Versions are sent as JSON numbers; 52 bits survive a round trip through a double
+VERSION_HEX_DIGITS = 13
+
+
+def article_fingerprint(article):
+    """
+    Content hash of everything the API lists for an article; regenerated learning
+    content, served by its own endpoints, does not make an article 'updated'.
+    """
+    encoded = json.dumps(article.to_api_dict(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def _longest_increasing(values):
+    """
+    Returns the indices of a longest strictly increasing subsequence of `values`.
+    """
+    tails = []  # tails[k]: index of the smallest tail of an increasing run of length k + 1
+    previous = [None] * len(values)
+    for index, value in enumerate(values):
+        low, high = 0, len(tails)
+        while low < high:
+            middle = (low + high) // 2
+            if values[tails[middle]] < value:
+                low = middle + 1
+            else:
+                high = middle
+        previous[index] = tails[low - 1] if low else None
+        if low == len(tails):
+            tails.append(index)
+        else:
+            tails[low] = index
+    kept = set()
+    index = tails[-1] if tails else None
+    while index is not None:
+        kept.add(index)
+        index = previous[index]
+    return kept
+
+
+class ChangeLog:
+    """
+    Bounded, versioned history of the article lists served per feed (a source
+    filter, or None for the merged feed), for delta sync.
+
+    Each version records {url: (fingerprint, article_id)}, so the changes since
+    any version still in the history are a comparison with the current list.
+    A version is derived from the list's content (URLs, order and fingerprints).
+    Every worker and instance serving the same snapshot reports the same version,
+    so a client can poll any of them. A version an instance has not seen (too old,
+    or a list only another instance served) gets a full resync instead.
+    """
+
+    def __init__(self, history=None):
+        self.history = history or settings.CHANGES_HISTORY
+        self.lock = threading.Lock()
+        self.current = {}  # feed -> (articles list, version)
+        self.versions = {}  # feed -> OrderedDict(version -> {url: (fingerprint, article_id)}), oldest first
+        self.fingerprints = {}  # url -> (record, fingerprint); records are immutable, so reused while unchanged
+
+    def _fingerprint(self, article):
+        url = article.get('url')
+        cached = self.fingerprints.get(url)
+        if cached is None or cached[0] is not article:
+            cached = (article, article_fingerprint(article))
+            self.fingerprints[url] = cached
+        return cached[1]
+
+    def version(self, feed, articles):
+        """
+        Returns the version of `articles`, recording it the first time this list is seen.
+        """
+        with self.lock:
+            cached = self.current.get(feed)
+            if cached is not None and cached[0] is articles:
+                return cached[1]
+
+            state = {}
+            digest = hashlib.sha1()
+            for article_id, article in enumerate(articles):
+                url = article.get('url')
+                if not url or url in state:
+                    continue
+                fingerprint = self._fingerprint(article)
+                state[url] = (fingerprint, article_id)
+                digest.update(f"{url}\0{fingerprint}\0{article_id}\n".encode('utf-8'))
+            version = int(digest.hexdigest()[:VERSION_HEX_DIGITS], 16)
+
+            history = self.versions.setdefault(feed, OrderedDict())
+            history[version] = state
+            history.move_to_end(version)
+            while len(history) > self.history:
+                history.popitem(last=False)
+            self.current[feed] = (articles, version)
+
+            # Forget fingerprints of articles that left every feed
+            live = set()
+            for feed_articles, _ in self.current.values():
+                live.update(article.get('url') for article in feed_articles)
+            for url in [url for url in self.fingerprints if url not in live]:
+                del self.fingerprints[url]
+            return version
+
+    def changes(self, feed, articles, since):
+        """
+        Returns (version, changes) for `articles` relative to version `since`:
+        changes holds the article_ids of 'added' and 'updated' articles, the URLs
+        of 'removed' ones, and 'moved' {url: article_id} for the unchanged articles
+        that changed order. changes is None if `since` is not in the history.
+
+        Unchanged articles are mostly only shifted by new ones at the top, so
+        'moved' lists just those outside the longest run still in their old
+        relative order. A client rebuilds the list by placing the added, updated
+        and moved articles at their article_ids, and filling the remaining slots
+        with its other surviving articles in their old order.
+        """
+        version = self.version(feed, articles)
+        with self.lock:
+            history = self.versions[feed]
+            previous = history.get(since)
+            current = history[version]
+        if previous is None:
+            return version, None
+
+        added, updated, unchanged = [], [], []
+        for url, (fingerprint, article_id) in current.items():
+            old = previous.get(url)
+            if old is None:
+                added.append(article_id)
+            elif old[0] != fingerprint:
+                updated.append(article_id)
+            else:
+                unchanged.append((url, article_id, old[1]))
+        in_order = _longest_increasing([old_id for _, _, old_id in unchanged])
+        moved = {url: article_id for index, (url, article_id, _) in enumerate(unchanged) if index not in in_order}
+        removed = [url for url in previous if url not in current]
+        return version, {'added': added, 'updated': updated, 'removed': removed, 'moved': moved}
@@ -1,52 +1,194 @@
 # app/services/audio_generator.py
 from io import BytesIO
 
+import hashlib
+import os
 import requests
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from app.config import settings
+from app.utils import metrics
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+TTS_MODEL = 'tts-1'
+
+
+def strip_id3(content):
+    """
+    Drops a leading ID3v2 tag, so MP3 segments concatenate into one clean stream.
+    """
+    if len(content) >= 10 and content[:3] == b'ID3':
+        size = 10 + ((content[6] & 0x7f) << 21 | (content[7] & 0x7f) << 14 | (content[8] & 0x7f) << 7 | content[9] & 0x7f)
+        if content[5] & 0x10:
+            size += 10  # Footer present
+        return content[size:]
+    return content
+
+
+class SpeechCache:
+    """
+    On-disk cache of synthesized speech segments, keyed by model, voice and text.
+
+    The directory may be shared by several workers, so recency is the files'
+    mtime, touched on every hit, and the cache is trimmed least-recently-used
+    first by the size actually on disk once it exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()  # One eviction pass at a time in this process
+
+    def key(self, voice, text):
+        return hashlib.sha1(f"{TTS_MODEL}\0{voice}\0{text}".encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        path = self.directory / f"{key}.mp3"
+        try:
+            os.utime(path)  # Marks it recently used
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, content):
+        name = f"{key}.mp3"
+        tmp_path = self.directory / f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, self.directory / name)
+        with self.lock:
+            self._evict(keep=name)
+
+    def _evict(self, keep):
+        """
+        Deletes the least recently used segments until the directory fits in
+        `max_bytes`, never deleting `keep`, the segment just written.
+        """
+        files = []
+        for path in self.directory.glob('*.mp3'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another worker meanwhile
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            if path.name == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+
+
 class AudioGenerator:
     def __init__(self):
         self.api_key = settings.OPENAI_API_KEY
-        self.base_url = "https://api.openai.com/v1/audio/speech"
+        self.base_url = f"{settings.OPENAI_BASE_URL}/audio/speech"
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
         self.female_voices = ['echo', 'fable', 'nova', 'shimmer']
         self.male_voices = ['alloy', 'onyx']
+        self.cache = SpeechCache(settings.TTS_CACHE_DIR, settings.TTS_CACHE_MAX_BYTES)
 
     def get_random_voice(self):
         return random.choice(self.female_voices + self.male_voices)
 
+    def get_stable_voice(self, key):
+        """
+        Picks the same voice every time for the same key (an article URL), so an
+        article keeps one narrator across requests and edits and its cached
+        segments stay reusable.
+        """
+        voices = self.female_voices + self.male_voices
+        return voices[int(hashlib.sha1(key.encode('utf-8')).hexdigest(), 16) % len(voices)]
+
+    def is_long_form(self, text):
+        return len(text) > settings.TTS_SEGMENT_CHARS
+
+    def synthesize_segment(self, text, voice):
+        """
+        Returns the MP3 bytes of one segment, from the cache or the TTS API.
+        Raises requests.exceptions.RequestException if the API call fails.
+        """
+        key = self.cache.key(voice, text)
+        content = self.cache.get(key)
+        if content is not None:
+            metrics.TTS_SEGMENT_CACHE.inc(result='hit')
+            return content
+        metrics.TTS_SEGMENT_CACHE.inc(result='miss')
+        data = {"model": TTS_MODEL, "input": text, "voice": voice}
+        with metrics.track_upstream('tts', 'speech_segment'):
+            response = requests.post(self.base_url, headers=self.headers, json=data)
+            response.raise_for_status()
+        self.cache.put(key, response.content)
+        return response.content
+
+    def generate_audio_segments(self, text: str, voice: str):
+        """
+        Long-form synthesis: splits the text into paragraph-aligned segments of at
+        most TTS_SEGMENT_CHARS characters and synthesizes them concurrently
+        (TTS_WORKERS at a time), reusing cached segments.
+
+        Yields the MP3 bytes of each segment in order as soon as it and every
+        segment before it are ready, so playback can start after the first one.
+        A segment that fails twice ends the stream early.
+        """
+        from app.services.text_chunking import split_into_segments
+
+        segments = split_into_segments(text, settings.TTS_SEGMENT_CHARS)
+        logger.info("Generating audio in %s segments with voice: %s", len(segments), voice)
+        executor = ThreadPoolExecutor(max_workers=max(1, min(settings.TTS_WORKERS, len(segments))),
+                                      thread_name_prefix='TTSSegment')
+        try:
+            futures = [executor.submit(self.synthesize_segment, segment, voice) for segment in segments]
+            for index, future in enumerate(futures):
+                try:
+                    content = future.result()
+                except requests.exceptions.RequestException as e:
+                    logger.warning("Segment %s of %s failed (%s); retrying.", index + 1, len(segments), e)
+                    try:
+                        content = self.synthesize_segment(segments[index], voice)
+                    except requests.exceptions.RequestException as e:
+                        logger.error("Giving up on segment %s of %s: %s", index + 1, len(segments), e)
+                        return
+                yield content if index == 0 else strip_id3(content)
+        finally:
+            # The client may disconnect mid-stream: drop segments nobody will hear
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def generate_audio(self, text: str, voice: str):
         """
         Generates audio content from the provided text using the specified voice.
         Returns the audio content as a BytesIO object.
         """
-        logger.info(f"Generating audio with voice: {voice}")
+        logger.info("Generating audio with voice: %s", voice)
 
         data = {
-            "model": "tts-1",
+            "model": TTS_MODEL,
             "input": text,
             "voice": voice
         }
 
         try:
             logger.info("Sending request to TTS API for audio.")
-            response = requests.post(self.base_url, headers=self.headers, json=data)
-            response.raise_for_status()
+            with metrics.track_upstream('tts', 'speech'):
+                response = requests.post(self.base_url, headers=self.headers, json=data)
+                response.raise_for_status()
             audio_content = response.content
             logger.info("Audio content received from TTS API.")
             return BytesIO(audio_content)
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error generating audio: {e}")
+            logger.error("Error generating audio: %s", e)
             if e.response is not None:
-                logger.error(f"Response Content: {e.response.text}")
+                logger.error("Response Content: %s", e.response.text)
             return None
         except Exception as e:
-            logger.error(f"An unexpected error occurred: {e}")
+            logger.error("An unexpected error occurred: %s", e)
             return None
\ No newline at end of file
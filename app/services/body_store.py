@@ -0,0 +1,94 @@
+# app/services/body_store.py
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from app.models.NewsArticle import BodyRef
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BodyStore:
+    """
+    Content-addressed, on-disk store for large article bodies.
+
+    Texts shorter than `inline_limit` characters are returned as-is and stay in
+    memory; longer ones are written once under their SHA-1 and replaced by a
+    BodyRef, so identical bodies across snapshots and sources are stored once.
+
+    Bodies no published snapshot references any more are deleted by retain()
+    once they have been unreferenced for `prune_grace` seconds.
+    """
+
+    def __init__(self, directory, inline_limit=1024, prune_grace=600):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.inline_limit = inline_limit
+        self.prune_grace = prune_grace
+        self.lock = threading.Lock()
+        self.live = {}  # source -> keys referenced by its current snapshot
+        self.unreferenced = {}  # key -> when it was first found unreferenced
+
+    def _path(self, key):
+        return self.directory / key[:2] / key[2:]
+
+    def put(self, text):
+        if len(text) < self.inline_limit:
+            return text
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        path = self._path(key)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(text, encoding='utf-8')
+            os.replace(tmp_path, path)
+        return BodyRef(key)
+
+    def get(self, key):
+        try:
+            return self._path(key).read_text(encoding='utf-8')
+        except FileNotFoundError:
+            logger.error("Article body %s is missing from the body store.", key)
+            return ''
+
+
+    def _stored_keys(self):
+        return {path.parent.name + path.name for path in self.directory.glob('??/*') if not path.name.startswith('.')}
+
+    def retain(self, source, keys):
+        """
+        Records the body keys referenced by the current snapshot of `source`, and
+        deletes bodies that no source has referenced for `prune_grace` seconds.
+        The grace period covers bodies written for a snapshot that is about to be
+        published, and other workers that still serve the previous snapshot.
+        """
+        now = time.time()
+        with self.lock:
+            self.live[source] = set(keys)
+            live = set().union(*self.live.values())
+            unreferenced = self._stored_keys() - live
+            self.unreferenced = {key: self.unreferenced.get(key, now) for key in unreferenced}
+            expired = [key for key, since in self.unreferenced.items() if now - since >= self.prune_grace]
+            for key in expired:
+                self._path(key).unlink(missing_ok=True)
+                del self.unreferenced[key]
+        if expired:
+            logger.info("Pruned %s unreferenced article bodies.", len(expired))
+
+
+_body_store = None
+
+
+def get_body_store():
+    """
+    Returns the process-wide BodyStore configured in settings.
+    """
+    global _body_store
+    if _body_store is None:
+        from app.config import settings
+        _body_store = BodyStore(settings.BODY_STORE_DIR, inline_limit=settings.BODY_INLINE_LIMIT,
+                                prune_grace=settings.BODY_PRUNE_GRACE_SECONDS)
+    return _body_store
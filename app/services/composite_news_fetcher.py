@@ -0,0 +1,168 @@
+# app/services/composite_news_fetcher.py
+
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from app.services.news_fetcher import NewsFetcher
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def published_timestamp(published_date):
+    """
+    UTC epoch seconds of a published date, so sources can be merged by time:
+    NBA stores 'YYYY-MM-DD' (taken as midnight UTC), DW full ISO timestamps.
+    Missing or unparseable dates sort last.
+    """
+    if not published_date:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(published_date.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _published_key(article):
+    return published_timestamp(article.get('published_date'))
+
+
+class CompositeNewsFetcher(NewsFetcher):
+    """
+    Serves several NewsFetcher sources behind one merged, time-ordered feed.
+
+    Every child keeps its own store and is refreshed independently, so a slow
+    scrape of one source never delays the snapshot of another.
+    """
+
+    def __init__(self, fetchers):
+        super().__init__()
+        self.fetchers = {fetcher.source_name: fetcher for fetcher in fetchers}
+        self.merge_lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self._sorted_snapshots = {}  # source -> (raw snapshot, snapshot sorted newest first)
+        self._merged_sources = None
+        self._merged_articles = []
+        self._refreshing = set()
+
+    def source_fetchers(self):
+        return dict(self.fetchers)
+
+    def refresh_jobs(self):
+        jobs = []
+        for fetcher in self.fetchers.values():
+            jobs.extend(fetcher.refresh_jobs())
+        return jobs
+
+    def set_refresh_on_read(self, enabled):
+        super().set_refresh_on_read(enabled)
+        for fetcher in self.fetchers.values():
+            fetcher.set_refresh_on_read(enabled)
+
+    def export_snapshot(self):
+        return {source: fetcher.export_snapshot() for source, fetcher in self.fetchers.items()}
+
+    def install_snapshot(self, snapshot):
+        for source, articles in snapshot.items():
+            if source in self.fetchers:
+                self.fetchers[source].install_snapshot(articles)
+
+    def add_snapshot_listener(self, listener):
+        for fetcher in self.fetchers.values():
+            fetcher.add_snapshot_listener(listener)
+
+    def load_cached_articles(self):
+        return self.get_cached_articles()
+
+    def save_cached_articles(self, articles):
+        # Each child persists its own store; the merged feed is derived on read.
+        for source, fetcher in self.fetchers.items():
+            fetcher.save_cached_articles([a for a in articles if a.get('source') == source])
+
+    def update_articles(self):
+        """
+        Refreshes all sources in parallel and waits for every one of them.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.fetchers) or 1) as executor:
+            for source in self.fetchers:
+                executor.submit(self.update_source, source)
+
+    def update_source(self, source):
+        fetcher = self.fetchers[source]
+        try:
+            fetcher.update_articles()
+        except Exception as e:
+            logger.error("Refreshing source %s failed: %s", source, e)
+        finally:
+            with self.refresh_lock:
+                self._refreshing.discard(source)
+
+    def _refresh_in_background(self, source):
+        with self.refresh_lock:
+            if source in self._refreshing:
+                return
+            self._refreshing.add(source)
+        threading.Thread(target=self.update_source, args=(source,),
+                         name=f"Refresh-{source}", daemon=True).start()
+
+    def _sorted_snapshot(self, source):
+        """
+        Returns the source snapshot sorted newest first, re-sorting only when the
+        child has published a new list.
+        """
+        fetcher = self.fetchers[source]
+        if fetcher.should_refresh_on_read():
+            self._refresh_in_background(source)
+        snapshot = fetcher.cached_articles
+        cached = self._sorted_snapshots.get(source)
+        if cached is None or cached[0] is not snapshot:
+            # sorted() is stable, so articles with the same date keep the source's own order
+            cached = (snapshot, sorted(snapshot, key=_published_key, reverse=True))
+            self._sorted_snapshots[source] = cached
+        return cached[1]
+
+    def get_cached_articles(self):
+        if self.refresh_on_read and not any(fetcher.cached_articles for fetcher in self.fetchers.values()):
+            # Nothing has been fetched for any source yet; block on a full refresh like a single fetcher would.
+            self.update_articles()
+        with self.merge_lock:
+            current = tuple(self._sorted_snapshot(source) for source in self.fetchers)
+            if self._merged_sources is None or any(a is not b for a, b in zip(current, self._merged_sources)):
+                # k-way merge of the per-source sorted snapshots
+                self._merged_articles = list(heapq.merge(*current, key=_published_key, reverse=True))
+                self._merged_sources = current
+            return self._merged_articles
+
+    def get_source_articles(self, source=None):
+        if source is None:
+            return self.get_cached_articles()
+        if source not in self.fetchers:
+            return []
+        with self.merge_lock:
+            return self._sorted_snapshot(source)
+
+    def is_cache_valid(self):
+        return all(fetcher.is_cache_valid() for fetcher in self.fetchers.values())
+
+    def fetch_articles(self):
+        with ThreadPoolExecutor(max_workers=len(self.fetchers) or 1) as executor:
+            results = list(executor.map(lambda f: f.fetch_articles(), self.fetchers.values()))
+        sorted_results = [sorted(r, key=_published_key, reverse=True) for r in results]
+        return list(heapq.merge(*sorted_results, key=_published_key, reverse=True))
+
+    def fetch_article_details(self, article_url):
+        for fetcher in self.fetchers.values():
+            if any(a.get('url') == article_url for a in fetcher.cached_articles):
+                return fetcher.fetch_article_details(article_url)
+        logger.warning("No source found for article URL: %s", article_url)
+        return {}
+
+    def adapt_text_to_level(self, text, level):
+        fetcher = next(iter(self.fetchers.values()))
+        return fetcher.adapt_text_to_level(text, level)
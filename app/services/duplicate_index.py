@@ -0,0 +1,189 @@
+# app/services/duplicate_index.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from app.config import settings
+from app.services.search_index import TOKEN_PATTERN, normalize_token
+from app.utils import metrics
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SIMHASH_BITS = 64
+
+
+def shingles(text):
+    """
+    Normalized words and word pairs of `text`; the pairs keep some word order,
+    so stories sharing only their team names do not look alike.
+    """
+    tokens = [normalize_token(token) for token in TOKEN_PATTERN.findall(text or '')]
+    return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def simhash(text):
+    """
+    64-bit SimHash of `text`: near-identical texts differ in only a few bits.
+    Uses blake2b rather than hash(), which is salted per process, so fingerprints
+    stay comparable across restarts.
+    """
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles(text):
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+def _text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class DuplicateIndex:
+    """
+    Near-duplicate index of the articles of one source, persisted across refreshes.
+
+    Articles are fingerprinted by the SimHash of their title and teaser. Articles
+    within `max_distance` bits of each other form a cluster. Its canonical member
+    is the one the index saw first, so the canonical stays the same from one
+    refresh to the next. The index also remembers the adaptations made at refresh
+    time by exact text, so an unchanged title, teaser or body is adapted once,
+    not on every refresh.
+    """
+
+    def __init__(self, path, source, max_distance=None, max_adaptations=None, ttl_days=None):
+        self.path = path
+        self.source = source
+        self.max_distance = max_distance if max_distance is not None else settings.DUPLICATE_MAX_DISTANCE
+        self.max_adaptations = max_adaptations or settings.DUPLICATE_MAX_ADAPTATIONS
+        self.ttl = (ttl_days or settings.DUPLICATE_TTL_DAYS) * 86400
+        self.lock = threading.Lock()
+        self.articles = {}  # url -> {'simhash', 'first_seen', 'last_seen', 'canonical'}
+        self.adaptations = OrderedDict()  # "level:text hash" -> adapted text, least recently used first
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable duplicate index %s: %s", self.path, e)
+            return
+        self.articles = data.get('articles', {})
+        self.adaptations = OrderedDict(data.get('adaptations', {}))
+        logger.info("Loaded duplicate index for %s: %s articles, %s adaptations.",
+                    self.source, len(self.articles), len(self.adaptations))
+
+    def save(self):
+        with self.lock:
+            cutoff = time.time() - self.ttl
+            self.articles = {url: entry for url, entry in self.articles.items() if entry['last_seen'] >= cutoff}
+            data = {'articles': self.articles, 'adaptations': self.adaptations}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_name(self.path.name + '.tmp')
+            with open(temporary, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temporary, self.path)
+
+    def _inherited_first_seen(self, fingerprint, default):
+        # A new URL for a known story (e.g. DW republishing an update) keeps the story's age
+        matches = [entry['first_seen'] for entry in self.articles.values()
+                   if hamming_distance(entry['simhash'], fingerprint) <= self.max_distance]
+        return min(matches, default=default)
+
+    def group(self, entries):
+        """
+        Clusters the near-duplicate entries of one refresh (dicts with 'url',
+        'title' and 'teaser'). Returns, for every entry, the index of its canonical
+        entry, or None if the entry is canonical itself.
+        """
+        now = time.time()
+        with self.lock:
+            fingerprints = []
+            ranks = []  # Oldest story first; on a tie (an inherited age), the former canonical, then known URLs
+            for index, entry in enumerate(entries):
+                fingerprint = simhash(f"{entry.get('title', '')}\n{entry.get('teaser', '')}")
+                known = self.articles.get(entry['url'])
+                first_seen = known['first_seen'] if known else self._inherited_first_seen(fingerprint, now)
+                was_canonical = bool(known and known.get('canonical'))
+                self.articles[entry['url']] = {'simhash': fingerprint, 'first_seen': first_seen, 'last_seen': now}
+                fingerprints.append(fingerprint)
+                ranks.append((first_seen, not was_canonical, known is None, index))
+
+        # Single-link clustering; a refresh has tens of entries, so pairwise is fine
+        parents = list(range(len(entries)))
+
+        def root(index):
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        for i in range(len(entries)):
+            for j in range(i + 1, len(entries)):
+                if hamming_distance(fingerprints[i], fingerprints[j]) <= self.max_distance:
+                    parents[root(j)] = root(i)
+
+        canonicals = {}
+        for index in range(len(entries)):
+            cluster = root(index)
+            best = canonicals.get(cluster)
+            if best is None or ranks[index] < ranks[best]:
+                canonicals[cluster] = index
+        canonical_of = [canonicals[root(index)] for index in range(len(entries))]
+        with self.lock:
+            for index, entry in enumerate(entries):
+                self.articles[entry['url']]['canonical'] = canonical_of[index] == index
+        duplicates = sum(1 for index, canonical in enumerate(canonical_of) if canonical != index)
+        if duplicates:
+            metrics.DUPLICATE_ARTICLES.inc(duplicates, source=self.source)
+            logger.info("Collapsing %s near-duplicate %s articles.", duplicates, self.source)
+        return [None if canonical == index else canonical for index, canonical in enumerate(canonical_of)]
+
+    def adapt(self, text, level, adapt):
+        """
+        Returns `adapt(text, level)`, reusing the result for a text adapted before.
+        """
+        if not text or not text.strip():
+            return adapt(text, level)
+        key = f"{level}:{_text_hash(text)}"
+        with self.lock:
+            adapted = self.adaptations.get(key)
+            if adapted is not None:
+                self.adaptations.move_to_end(key)
+        if adapted is not None:
+            metrics.ADAPTATION_REUSE.inc(source=self.source, result='hit')
+            return adapted
+
+        metrics.ADAPTATION_REUSE.inc(source=self.source, result='miss')
+        adapted = adapt(text, level)
+        if adapted:
+            with self.lock:
+                self.adaptations[key] = adapted
+                while len(self.adaptations) > self.max_adaptations:
+                    self.adaptations.popitem(last=False)
+        return adapted
+
+
+def collapse_duplicates(articles, canonical_of):
+    """
+    Drops the duplicate articles from a refresh, listing each one under its
+    canonical article as {'title', 'url'} in 'duplicates'.
+    """
+    collapsed = []
+    for article, canonical in zip(articles, canonical_of):
+        if canonical is None:
+            collapsed.append(article)
+        else:
+            articles[canonical].setdefault('duplicates', []).append({'title': article['title'], 'url': article['url']})
+    return collapsed
@@ -1,32 +1,36 @@
 # app/services/dw_news_fetcher.py
 
 from app.services.news_fetcher import NewsFetcher
+from app.models.NewsArticle import to_json
 import requests
-from bs4 import BeautifulSoup
-from app.services.openai_client import OpenAIClient
+from app.services.openai_client import get_openai_client
+from app.services.duplicate_index import collapse_duplicates
 import threading
 import time
 import json
-from app.utils.logger import get_logger
+from app.utils import metrics
+from app.utils.logger import get_logger, HOT_PATH
 from app.config import settings
 import re
 
 logger = get_logger(__name__)
 
 class DWNewsFetcher(NewsFetcher):
+    source_name = 'dw'
+
     def __init__(self):
         super().__init__()
         self.news_json_path = settings.NEWS_JSON_PATH_DW  # Ensure this path is set in settings
-        self.cached_articles = self.load_cached_articles()
-        self.openai_client = OpenAIClient()
+        self.publish_articles(self.load_cached_articles())
+        self.openai_client = get_openai_client()
 
     def load_cached_articles(self):
         with self.news_lock:
             if self.news_json_path.exists():
                 with open(self.news_json_path, 'r', encoding='utf-8') as f:
-                    news_articles = json.load(f)
+                    news_articles = self.tag_source(json.load(f))
                 logger.info("Loaded DW news articles from cache.")
-                self.last_updated = time.time()
+                self.last_updated = self.news_json_path.stat().st_mtime
                 return news_articles
             else:
                 logger.info("No cached DW news articles found.")
@@ -35,88 +39,113 @@ class DWNewsFetcher(NewsFetcher):
     def save_cached_articles(self, articles):
         with self.news_lock:
             with open(self.news_json_path, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=4)
+                json.dump(articles, f, ensure_ascii=False, indent=4, default=to_json)
             self.last_updated = time.time()
-            logger.info(f"Saved {len(articles)} DW news articles to cache.")
+            logger.info("Saved %s DW news articles to cache.", len(articles))
 
     def get_cached_articles(self):
-        if self.is_cache_valid():
-            logger.info("Using cached DW news.")
+        if not self.should_refresh_on_read():
+            logger.info("Using cached DW news.", extra=HOT_PATH)
             return self.cached_articles
         else:
             self.update_articles()
             return self.cached_articles
 
     def update_articles(self):
+        started_at = time.perf_counter()
         logger.info("Fetching new DW news from DW website.")
         news_articles = self.fetch_articles()
         if news_articles:
+            self.prepare_articles(news_articles)
             self.save_cached_articles(news_articles)
-            self.cached_articles = news_articles
+            self.publish_articles(news_articles)
             logger.info("DW news articles updated successfully.")
         else:
             logger.warning("No new DW articles were fetched.")
+        # Measures the whole refresh, including learning content, saving and publishing
+        self.record_refresh(started_at, news_articles)
 
     def fetch_articles(self):
-        url = "https://www.dw.com/de/themen/s-9077"
+        url = settings.DW_NEWS_URL
         try:
-            response = requests.get(url)
-            response.raise_for_status()
+            response = self.http_get(url)
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to retrieve DW news. Error: {e}")
+            logger.error("Failed to retrieve DW news. Error: %s", e)
+            self.report_progress('failed')
             return []
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        article_urls = set()
-
-        # Define a regex pattern for article URLs
-        article_url_pattern = re.compile(r'^/de/[\w\-/]+/a-\d+$')
-
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if article_url_pattern.match(href):
-                full_url = "https://www.dw.com" + href
-                article_urls.add(full_url)
+        article_urls = self.parse_article_urls(response.text)
 
         news_list = []
 
         for article_url in article_urls:
             article_details = self.fetch_article_details(article_url)
-            if article_details:
-                # Prepare the teaser
-                teaser = article_details.get('teaser', article_details['text'][:150])
-
-                # Get or generate published date
-                published_date = article_details.get('published_date', time.strftime('%Y-%m-%d'))
-
-                # Adapt the text to A1 level
-                adapted_text = self.adapt_text_to_level(article_details['text'], 'A1')
-
-                adapted_texts = {'A1': adapted_text} if adapted_text else {}
-
+            if not article_details:
+                self.report_progress('failed')
+            else:
+                self.report_progress('scraped')
                 news_list.append({
                     'title': article_details['title'],
-                    'published_date': published_date,
-                    'teaser': teaser,
+                    # Get or generate published date
+                    'published_date': article_details.get('published_date', time.strftime('%Y-%m-%d')),
+                    'teaser': article_details.get('teaser', article_details['text'][:150]),
                     'text': article_details['text'],
                     'image_url': article_details.get('image_url', ''),
                     'url': article_details.get('url', article_url),
-                    'adapted_texts': adapted_texts
+                    'adapted_texts': {}
                 })
 
-        logger.info(f"Fetched {len(news_list)} DW news articles.")
+        # DW republishes updated stories under new URLs: only the canonical version is adapted and listed
+        canonical_of = self.duplicate_index.group(news_list)
+        for article, canonical in zip(news_list, canonical_of):
+            if canonical is None:
+                # Adapt the text to A1 level
+                adapted_text = self.adapt_reusing(article['text'], 'A1')
+                self.report_progress('adapted' if adapted_text else 'failed')
+                if adapted_text:
+                    article['adapted_texts']['A1'] = adapted_text
+
+        news_list = collapse_duplicates(news_list, canonical_of)
+        self.duplicate_index.save()
+        self.tag_source(news_list)
+        logger.info("Fetched %s DW news articles.", len(news_list))
         return news_list
 
+    def parse_article_urls(self, page_text):
+        """
+        Collects the absolute article URLs linked from the DW topic page.
+        """
+        from bs4 import BeautifulSoup  # Imported on first scrape, not at startup
+        soup = BeautifulSoup(page_text, 'html.parser')
+        article_urls = set()
+
+        # Define a regex pattern for article URLs
+        article_url_pattern = re.compile(r'^/de/[\w\-/]+/a-\d+$')
+
+        for link in soup.find_all('a', href=True):
+            href = link['href']
+            if article_url_pattern.match(href):
+                full_url = settings.DW_BASE_URL + href
+                article_urls.add(full_url)
+
+        return article_urls
+
     def fetch_article_details(self, article_url):
-        logger.info(f"Fetching DW article details from URL: {article_url}")
+        logger.info("Fetching DW article details from URL: %s", article_url)
         try:
-            response = requests.get(article_url)
-            response.raise_for_status()
+            response = self.http_get(article_url)
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to retrieve DW article details. Error: {e}")
+            logger.error("Failed to retrieve DW article details. Error: %s", e)
             return {}
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        return self.parse_article_details(response.text, article_url)
+
+    def parse_article_details(self, page_text, article_url):
+        """
+        Extracts title, teaser, body, image and date from a DW article page.
+        """
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(page_text, 'html.parser')
 
         # Extract article details
         # For DW, the article content is often in a script tag named "window.__DW_SPT"
@@ -137,7 +166,7 @@ class DWNewsFetcher(NewsFetcher):
                         image_url = article_data.get('image_url', '')
                         published_date = article_data.get('date', '')
 
-                        logger.info(f"Fetched DW article details: {title}")
+                        logger.info("Fetched DW article details: %s", title)
 
                         return {
                             'title': title,
@@ -147,7 +176,7 @@ class DWNewsFetcher(NewsFetcher):
                             'published_date': published_date,
                             'url': article_url
                         }
-        logger.error(f"Could not extract article details from {article_url}")
+        logger.error("Could not extract article details from %s", article_url)
         return {}
 
     def extract_article_json(self, script_content):
@@ -162,7 +191,7 @@ class DWNewsFetcher(NewsFetcher):
             logger.info("Successfully extracted JSON data from window.__DW_SPT")
             return article_json
         except json.JSONDecodeError as e:
-            logger.error(f"Error decoding JSON: {e}")
+            logger.error("Error decoding JSON: %s", e)
             return None
 
     def parse_dw_article_json(self, app_state_json):
@@ -178,17 +207,17 @@ class DWNewsFetcher(NewsFetcher):
             article_data = app_state_json.get('data', {}).get('article', {})
             return article_data
         except Exception as e:
-            logger.error(f"Error parsing article JSON: {e}")
+            logger.error("Error parsing article JSON: %s", e)
             return None
 
     def adapt_text_to_level(self, text, level):
         """
         Adapts the text to the specified level using OpenAI's API.
         """
-        logger.info(f"Adapting text to level {level}.")
+        logger.info("Adapting text to level %s.", level, extra=HOT_PATH)
         adapted_text = self.openai_client.adapt_text_to_level(text, level)
         if adapted_text:
-            logger.info("Text adaptation successful.")
+            logger.debug("Text adaptation successful.")
         else:
             logger.error("Text adaptation failed.")
         return adapted_text
@@ -199,8 +228,10 @@ class DWNewsFetcher(NewsFetcher):
         """
         adapted_texts = article.get('adapted_texts', {})
         if level in adapted_texts:
-            logger.info(f"Using cached adapted text for level {level}.")
+            metrics.ADAPTATION_CACHE.inc(result='hit')
+            logger.info("Using cached adapted text for level %s.", level, extra=HOT_PATH)
             return adapted_texts[level]
         else:
-            logger.warning(f"Adapted text for level {level} not found.")
+            metrics.ADAPTATION_CACHE.inc(result='miss')
+            logger.warning("Adapted text for level %s not found.", level)
             return None
\ No newline at end of file
@@ -0,0 +1,193 @@
+# app/services/image_cache.py
+
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+import requests
+from app.config import settings
+from app.utils import metrics
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from PIL import Image
+    DECODE_ERRORS = (OSError, Image.DecompressionBombError)
+except ImportError:  # Pillow is optional; without it the original image is cached unchanged
+    Image = None
+    DECODE_ERRORS = (OSError,)
+
+IMAGE_SIGNATURES = ((b'\xff\xd8\xff', 'image/jpeg'), (b'\x89PNG', 'image/png'), (b'GIF8', 'image/gif'), (b'RIFF', 'image/webp'))
+
+
+class ImageTooLargeError(ValueError):
+    pass
+
+
+def image_key(image_url):
+    """
+    Content key of a source image URL, used as the immutable cache-busting version.
+    """
+    return hashlib.sha1(image_url.encode('utf-8')).hexdigest()[:16]
+
+
+class ImageCache:
+    """
+    Fetches each source image once and keeps resized, re-encoded thumbnails on disk.
+
+    Concurrent requests for the same image share one download (single-flight), and
+    the directory is trimmed least-recently-used first once it exceeds `max_bytes`.
+    Recency is the file's mtime, touched on every hit, and sizes are read from disk,
+    so workers sharing the directory agree on what to evict.
+
+    New images are prefetched only while `prefetch()` returns true, normally on the
+    refresh leader, so workers and followers do not all download every image.
+    """
+
+    def __init__(self, directory, max_bytes, sizes, max_source_bytes=None, prefetch=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.sizes = sizes  # size name -> maximum width in pixels
+        self.max_source_bytes = max_source_bytes or settings.IMAGE_MAX_SOURCE_BYTES
+        self.prefetch = prefetch
+        self.lock = threading.Lock()
+        self.inflight = {}  # key -> lock held while that image is being fetched
+        self.urls = {}  # key -> source image URL, from the published snapshots
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ImagePrefetch')
+
+    def _file_name(self, key, size):
+        extension = '.jpg' if Image is not None else '.orig'
+        return f"{key}-{size}{extension}"
+
+    def _lookup(self, key, size):
+        path = self.directory / self._file_name(key, size)
+        try:
+            os.utime(path)  # Marks it recently used
+        except FileNotFoundError:
+            return None
+        return path
+
+    def _store(self, name, content):
+        tmp_path = self.directory / f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, self.directory / name)
+
+    def _evict(self, keep):
+        """
+        Deletes the least recently used files until the directory fits in `max_bytes`,
+        never deleting the files named in `keep`.
+        """
+        files = []
+        for path in self.directory.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another worker meanwhile
+            if path.is_file() and not path.name.startswith('.'):
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            if path.name in keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _render(self, content, width):
+        if Image is None:
+            return content
+        with Image.open(io.BytesIO(content)) as image:
+            image = image.convert('RGB')
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format='JPEG', quality=80, optimize=True, progressive=True)
+            return output.getvalue()
+
+    def _download(self, image_url):
+        with metrics.track_upstream('image', urlparse(image_url).netloc):
+            with requests.get(image_url, timeout=20, stream=True) as response:
+                response.raise_for_status()
+                length = response.headers.get('Content-Length')
+                if length and length.isdigit() and int(length) > self.max_source_bytes:
+                    raise ImageTooLargeError(f"{length} bytes")
+                content = bytearray()
+                for chunk in response.iter_content(64 * 1024):
+                    content += chunk
+                    if len(content) > self.max_source_bytes:
+                        raise ImageTooLargeError(f"over {self.max_source_bytes} bytes")
+        return bytes(content)
+
+    def _fetch(self, key, image_url):
+        content = self._download(image_url)
+        names = []
+        for size, width in self.sizes.items():
+            names.append(self._file_name(key, size))
+            self._store(names[-1], self._render(content, width))
+        self._evict(keep=set(names))
+        logger.info("Cached thumbnails for %s.", image_url)
+
+    def get(self, image_url, size):
+        """
+        Returns (path, content type) of the thumbnail, fetching the source image if needed.
+        Returns None if the image could not be fetched or decoded.
+        """
+        key = image_key(image_url)
+        path = self._lookup(key, size)
+        if path is not None:
+            return path, self.content_type(path)
+
+        with self.lock:
+            flight = self.inflight.setdefault(key, threading.Lock())
+        with flight:
+            # Another request may have fetched it while we waited for the flight lock
+            path = self._lookup(key, size)
+            if path is None:
+                try:
+                    self._fetch(key, image_url)
+                except (requests.exceptions.RequestException, ImageTooLargeError) + DECODE_ERRORS as e:
+                    logger.error("Could not fetch image %s: %s", image_url, e)
+                    return None
+                finally:
+                    with self.lock:
+                        self.inflight.pop(key, None)
+                path = self._lookup(key, size)
+        return (path, self.content_type(path)) if path is not None else None
+
+    def content_type(self, path):
+        if path.suffix == '.jpg':
+            return 'image/jpeg'
+        with open(path, 'rb') as f:
+            head = f.read(4)
+        for signature, content_type in IMAGE_SIGNATURES:
+            if head.startswith(signature):
+                return content_type
+        return 'application/octet-stream'
+
+    def url_for_key(self, key):
+        with self.lock:
+            return self.urls.get(key)
+
+    def update_source(self, source, articles):
+        """
+        Snapshot listener: remembers image URLs by key and prefetches new images.
+        """
+        new_urls = []
+        with self.lock:
+            for article in articles:
+                image_url = article.get('image_url')
+                if image_url:
+                    key = image_key(image_url)
+                    if key not in self.urls:
+                        new_urls.append(image_url)
+                    self.urls[key] = image_url
+        if self.prefetch is not None and self.prefetch():
+            smallest = min(self.sizes, key=self.sizes.get)
+            for image_url in new_urls:
+                self.prefetch_executor.submit(self.get, image_url, smallest)
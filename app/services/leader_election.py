@@ -0,0 +1,108 @@
+# app/services/leader_election.py
+
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def default_holder_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class FileLease:
+    """
+    Leadership held through an exclusive, non-blocking flock on a shared file.
+
+    The lock is released by the kernel when the holding process exits.
+    """
+
+    def __init__(self, path, holder_id=None):
+        self.path = str(path)
+        self.holder_id = holder_id or default_holder_id()
+        self._fd = None
+
+    def acquire(self):
+        import fcntl
+
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, self.holder_id.encode('utf-8'))
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        import fcntl
+
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+class SqliteLease:
+    """
+    Leadership held through a time-limited lease row in a shared SQLite database.
+
+    The holder must call acquire() again before `ttl` seconds pass to renew it;
+    otherwise any other instance may take over.
+    """
+
+    def __init__(self, path, ttl=60, name='refresher', holder_id=None):
+        self.path = str(path)
+        self.ttl = ttl
+        self.name = name
+        self.holder_id = holder_id or default_holder_id()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lease ("
+                "name TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def acquire(self):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT holder, expires_at FROM lease WHERE name = ?", (self.name,)).fetchone()
+            if row is not None and row[0] != self.holder_id and row[1] > now:
+                conn.execute("COMMIT")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO lease (name, holder, expires_at) VALUES (?, ?, ?)",
+                (self.name, self.holder_id, now + self.ttl)
+            )
+            conn.execute("COMMIT")
+            return True
+        except sqlite3.Error as e:
+            logger.error("Leader lease error: %s", e)
+            return False
+        finally:
+            conn.close()
+
+    def release(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM lease WHERE name = ? AND holder = ?", (self.name, self.holder_id))
+        except sqlite3.Error as e:
+            logger.error("Could not release leader lease: %s", e)
+        finally:
+            conn.close()
@@ -0,0 +1,202 @@
+# app/services/learning_content.py
+
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from app.config import settings
+from app.services.search_index import normalize_token
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LIST_MARKER_PATTERN = re.compile(r'^\s*(?:\d+\s*[.)]|[-*•–])\s*')
+VOCABULARY_SEPARATOR_PATTERN = re.compile(r'\s+[–—-]\s+|\s*:\s+|\s*=\s*|\s+→\s+')
+ARTICLE_PATTERN = re.compile(r'^(der|die|das)\s+(.+)$', re.IGNORECASE)
+PARENTHESES_PATTERN = re.compile(r'\s*[(\[].*?[)\]]')
+# "die Mannschaft (the team)": no separator, the translation in trailing parentheses
+TRAILING_TRANSLATION_PATTERN = re.compile(r'^(.+?)\s*[(\[]([^()\[\]]+)[)\]]$')
+
+
+def parse_vocabulary(text):
+    """
+    Parses the free-text list from OpenAIClient.generate_vocabulary into
+    {'article', 'lemma', 'translation'} entries. 'article' is der/die/das, or None
+    for words without one (verbs, adjectives). Lines without a separator may give
+    the translation in trailing parentheses instead.
+    """
+    entries = []
+    seen = set()
+    for line in (text or '').splitlines():
+        line = LIST_MARKER_PATTERN.sub('', line.replace('**', '').replace('__', '')).strip()
+        if not line:
+            continue
+        parts = VOCABULARY_SEPARATOR_PATTERN.split(line, maxsplit=1)
+        if len(parts) != 2:
+            match = TRAILING_TRANSLATION_PATTERN.match(line)
+            if not match:
+                continue
+            parts = match.groups()
+        german, translation = (part.strip().strip('"„“') for part in parts)
+        german = PARENTHESES_PATTERN.sub('', german).strip().rstrip(',;')
+        if not german or not translation:
+            continue
+        match = ARTICLE_PATTERN.match(german)
+        article, lemma = (match.group(1).lower(), match.group(2).strip()) if match else (None, german)
+        key = lemma_key(lemma)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        entries.append({'article': article, 'lemma': lemma, 'translation': translation})
+    return entries
+
+
+def parse_questions(text):
+    """
+    Splits OpenAIClient.generate_questions output into a list of questions.
+    """
+    lines = [LIST_MARKER_PATTERN.sub('', line).replace('**', '').strip() for line in (text or '').splitlines()]
+    lines = [line for line in lines if line]
+    questions = [line for line in lines if line.endswith('?')]
+    return questions or lines
+
+
+def lemma_key(lemma):
+    return normalize_token(' '.join(lemma.split()))
+
+
+def learning_text(article, level):
+    """
+    Returns the adapted text the learning content for `level` is generated from.
+    """
+    text = (article.get('adapted_texts') or {}).get(level)
+    if not text and level == 'A1':
+        text = article.get('adapted_teaser')
+    return text or ''
+
+
+def _text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def prepare_learning_content(articles, previous_articles, openai_client, levels=None):
+    """
+    Precomputes vocabulary and comprehension questions for every article and level,
+    stored as article['learning'][level] = {'vocabulary', 'questions', 'text_hash'}.
+
+    Content is reused from the previous snapshot when the adapted text is unchanged,
+    so only new or edited articles cost LLM calls.
+    """
+    levels = levels or settings.LEARNING_LEVELS
+    previous = {a.get('url'): a.get('learning') or {} for a in previous_articles or [] if a.get('url')}
+
+    jobs = []
+    for article in articles:
+        learning = article.setdefault('learning', {})
+        for level in levels:
+            text = learning_text(article, level)
+            if not text:
+                continue
+            text_hash = _text_hash(text)
+            cached = previous.get(article.get('url'), {}).get(level)
+            if cached and cached.get('text_hash') == text_hash:
+                learning[level] = cached
+            else:
+                jobs.append((learning, level, text, text_hash))
+
+    def generate(job):
+        learning, level, text, text_hash = job
+        vocabulary = openai_client.generate_vocabulary(text)
+        questions = openai_client.generate_questions(text)
+        if vocabulary is None or questions is None:
+            return False  # Retried on the next refresh
+        learning[level] = {
+            'vocabulary': parse_vocabulary(vocabulary),
+            'questions': parse_questions(questions),
+            'text_hash': text_hash,
+        }
+        return True
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=settings.LEARNING_WORKERS) as executor:
+            generated = sum(executor.map(generate, jobs))
+        logger.info("Generated learning content for %s of %s article levels.", generated, len(jobs))
+    return articles
+
+
+def _published_day(article):
+    value = (article.get('published_date') or '')[:10]
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+class VocabularyIndex:
+    """
+    Corpus-wide lemma index over the precomputed vocabulary lists.
+
+    Answers "which articles contain word X" and "most frequent new words" from
+    memory. Kept up to date per source through snapshot listeners. The first day a
+    lemma was seen is remembered across snapshots, so words that scroll out of
+    the feed do not come back as "new".
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.source_entries = {}  # source -> {lemma key: {url: (entry, level, published day)}}
+        self.first_seen = {}  # lemma key -> date
+
+    def update_source(self, source, articles):
+        entries = {}
+        today = date.today()
+        for article in articles:
+            url = article.get('url')
+            day = _published_day(article) or today
+            for level, content in (article.get('learning') or {}).items():
+                for entry in content.get('vocabulary', ()):
+                    key = lemma_key(entry['lemma'])
+                    entries.setdefault(key, {}).setdefault(url, (entry, level, day))
+        with self.lock:
+            self.source_entries[source] = entries
+            for key, occurrences in entries.items():
+                earliest = min(day for _, _, day in occurrences.values())
+                if key not in self.first_seen or earliest < self.first_seen[key]:
+                    self.first_seen[key] = earliest
+
+    def articles_with(self, lemma, source=None):
+        """
+        Returns {url: entry} for articles whose vocabulary contains `lemma`.
+        """
+        key = lemma_key(ARTICLE_PATTERN.sub(r'\2', lemma.strip()))
+        found = {}
+        with self.lock:
+            for name, entries in self.source_entries.items():
+                if source is None or name == source:
+                    for url, (entry, _, _) in entries.get(key, {}).items():
+                        found[url] = entry
+        return found
+
+    def new_words(self, days=7, limit=20, source=None):
+        """
+        Returns the lemmas first seen in the last `days` days, most frequent first.
+        """
+        since = date.today() - timedelta(days=days)
+        counts = {}
+        with self.lock:
+            for name, entries in self.source_entries.items():
+                if source is not None and name != source:
+                    continue
+                for key, occurrences in entries.items():
+                    if self.first_seen.get(key, since) < since:
+                        continue
+                    recent = [entry for entry, _, day in occurrences.values() if day >= since]
+                    if recent:
+                        count, entry = counts.get(key, (0, recent[0]))
+                        counts[key] = (count + len(recent), entry)
+            ranked = sorted(counts.items(), key=lambda item: (-item[1][0], item[0]))[:limit]
+            return [
+                {**entry, 'count': count, 'first_seen': self.first_seen[key].isoformat()}
+                for key, (count, entry) in ranked
+            ]
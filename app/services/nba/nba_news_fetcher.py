@@ -1,13 +1,15 @@
 # app/services/nba_news_fetcher.py
 
 from app.services.news_fetcher import NewsFetcher
+from app.models.NewsArticle import to_json
 import requests
-from bs4 import BeautifulSoup
-from app.services.openai_client import OpenAIClient
+from app.services.openai_client import get_openai_client
+from app.services.duplicate_index import collapse_duplicates
 import threading
 import time
 import json
-from app.utils.logger import get_logger
+from app.utils import metrics
+from app.utils.logger import get_logger, HOT_PATH
 from app.config import settings
 from pathlib import Path
 import re
@@ -16,19 +18,21 @@ import html  # Import html module to unescape HTML entities
 logger = get_logger(__name__)
 
 class NBANewsFetcher(NewsFetcher):
+    source_name = 'nba'
+
     def __init__(self):
         super().__init__()
         self.news_json_path = settings.NEWS_JSON_PATH  # Ensure this path is set in settings
-        self.cached_articles = self.load_cached_articles()
-        self.openai_client = OpenAIClient()
+        self.publish_articles(self.load_cached_articles())
+        self.openai_client = get_openai_client()
 
     def load_cached_articles(self):
         with self.news_lock:
             if self.news_json_path.exists():
                 with open(self.news_json_path, 'r', encoding='utf-8') as f:
-                    news_articles = json.load(f)
+                    news_articles = self.tag_source(json.load(f))
                 logger.info("Loaded NBA news articles from cache.")
-                self.last_updated = time.time()
+                self.last_updated = self.news_json_path.stat().st_mtime
                 return news_articles
             else:
                 logger.info("No cached NBA news articles found.")
@@ -37,39 +41,83 @@ class NBANewsFetcher(NewsFetcher):
     def save_cached_articles(self, articles):
         with self.news_lock:
             with open(self.news_json_path, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=4)
+                json.dump(articles, f, ensure_ascii=False, indent=4, default=to_json)
             self.last_updated = time.time()
-            logger.info(f"Saved {len(articles)} NBA news articles to cache.")
+            logger.info("Saved %s NBA news articles to cache.", len(articles))
 
     def get_cached_articles(self):
-        if self.is_cache_valid():
-            logger.info("Using cached NBA news.")
+        if not self.should_refresh_on_read():
+            logger.info("Using cached NBA news.", extra=HOT_PATH)
             return self.cached_articles
         else:
             self.update_articles()
             return self.cached_articles
 
     def update_articles(self):
+        started_at = time.perf_counter()
         logger.info("Fetching new NBA news from Slamdunk website.")
         news_articles = self.fetch_articles()
         if news_articles:
+            self.prepare_articles(news_articles)
             self.save_cached_articles(news_articles)
-            self.cached_articles = news_articles
+            self.publish_articles(news_articles)
             logger.info("NBA news articles updated successfully.")
         else:
             logger.warning("No new NBA articles were fetched.")
+        # Measures the whole refresh, including learning content, saving and publishing
+        self.record_refresh(started_at, news_articles)
 
     def fetch_articles(self):
-        url = "https://www.slamdunk.ru/news/nba/"
+        url = settings.NBA_NEWS_URL
         try:
-            response = requests.get(url)
-            response.raise_for_status()
+            response = self.http_get(url)
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to retrieve NBA news. Error: {e}")
+            logger.error("Failed to retrieve NBA news. Error: %s", e)
+            self.report_progress('failed')
             return []
 
-        soup = BeautifulSoup(response.content, 'html.parser')
         news_list = []
+        entries = self.parse_news_list(response.content)
+        # Near-duplicates of another entry are collapsed into it, so only canonical entries are adapted
+        canonical_of = self.duplicate_index.group(entries)
+
+        for entry, canonical in zip(entries, canonical_of):
+            self.report_progress('scraped')
+            if canonical is not None:
+                news_list.append(entry)
+                continue
+            # Adapt the title and teaser to A1 level
+            adapted_title = self.adapt_reusing(entry['title'], 'A1')
+            adapted_teaser = self.adapt_reusing(entry['teaser'], 'A1')
+            self.report_progress('adapted' if adapted_title and adapted_teaser else 'failed')
+            adapted_title = adapted_title or entry['title']
+            adapted_teaser = adapted_teaser or entry['teaser']
+
+            news_list.append({
+                'title': entry['title'],
+                'adapted_title': adapted_title,
+                'published_date': time.strftime('%Y-%m-%d'),
+                'teaser': entry['teaser'],
+                'adapted_teaser': adapted_teaser,
+                'text': '',  # Will be filled later
+                'image_url': entry['image_url'],
+                'url': entry['url'],
+                'adapted_texts': {}  # Empty dict; full article adaptation happens on demand
+            })
+
+        news_list = collapse_duplicates(news_list, canonical_of)
+        self.duplicate_index.save()
+        self.tag_source(news_list)
+        logger.info("Fetched %s NBA news articles.", len(news_list))
+        return news_list
+
+    def parse_news_list(self, page_content):
+        """
+        Parses the Slamdunk news list page into title, teaser, image URL and URL entries.
+        """
+        from bs4 import BeautifulSoup  # Imported on first scrape, not at startup
+        soup = BeautifulSoup(page_content, 'html.parser')
+        entries = []
 
         articles = soup.find_all('article', class_='invisionNews_grid_item')
 
@@ -87,7 +135,7 @@ class NBANewsFetcher(NewsFetcher):
                 original_teaser = teaser_section.get_text(separator='\n', strip=True)
             else:
                 original_teaser = ''
-                logger.warning(f"Teaser not found for article: {original_title}")
+                logger.warning("Teaser not found for article: %s", original_title)
 
             # Extract the image URL from the style attribute
             # Use a lambda function to find the div with class containing 'invisionNews_grid_item__image'
@@ -107,41 +155,36 @@ class NBANewsFetcher(NewsFetcher):
                         image_url = 'https://www.slamdunk.ru' + image_url
                 else:
                     image_url = ''
-                    logger.warning(f"Image URL not found in style attribute for article: {original_title}")
+                    logger.warning("Image URL not found in style attribute for article: %s", original_title)
             else:
                 image_url = ''
-                logger.warning(f"Image not found for article: {original_title}")
-
-            # Adapt the title and teaser to A1 level
-            adapted_title = self.adapt_text_to_level(original_title, 'A1') or original_title
-            adapted_teaser = self.adapt_text_to_level(original_teaser, 'A1') or original_teaser
+                logger.warning("Image not found for article: %s", original_title)
 
-
-            news_list.append({
+            entries.append({
                 'title': original_title,
-                'adapted_title': adapted_title,
-                'published_date': time.strftime('%Y-%m-%d'),
                 'teaser': original_teaser,
-                'adapted_teaser': adapted_teaser,
-                'text': '',  # Will be filled later
                 'image_url': image_url,
                 'url': article_url,
-                'adapted_texts': {}  # Empty dict; full article adaptation happens on demand
             })
 
-        logger.info(f"Fetched {len(news_list)} NBA news articles.")
-        return news_list
+        return entries
 
     def fetch_article_details(self, article_url):
-        logger.info(f"Fetching NBA article details from URL: {article_url}")
+        logger.info("Fetching NBA article details from URL: %s", article_url)
         try:
-            response = requests.get(article_url)
-            response.raise_for_status()
+            response = self.http_get(article_url)
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to retrieve NBA article details. Error: {e}")
+            logger.error("Failed to retrieve NBA article details. Error: %s", e)
             return {}
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        return self.parse_article_details(response.content, article_url)
+
+    def parse_article_details(self, page_content, article_url):
+        """
+        Parses a Slamdunk article page into its title, image and body.
+        """
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(page_content, 'html.parser')
         title_meta = soup.find('meta', property='og:title')
         image_meta = soup.find('meta', property='og:image')
 
@@ -163,11 +206,11 @@ class NBANewsFetcher(NewsFetcher):
             # Extract HTML content if needed
             article_body_html = ''.join(str(element) for element in article_body_section.contents)
         else:
-            logger.warning(f"Article body not found for URL: {article_url}")
+            logger.warning("Article body not found for URL: %s", article_url)
             article_body_text = ''
             article_body_html = ''
 
-        logger.info(f"Fetched NBA article details: {title}")
+        logger.info("Fetched NBA article details: %s", title)
         return {
             'title': title,
             'image_url': image_url,
@@ -181,10 +224,10 @@ class NBANewsFetcher(NewsFetcher):
             return ''
 
         # Proceed with adaptation
-        logger.info(f"Adapting text to level {level}.")
+        logger.info("Adapting text to level %s.", level, extra=HOT_PATH)
         adapted_text = self.openai_client.adapt_text_to_level(text, level)
         if adapted_text:
-            logger.info("Text adaptation successful.")
+            logger.debug("Text adaptation successful.")
         else:
             logger.error("Text adaptation failed.")
         return adapted_text
@@ -195,17 +238,20 @@ class NBANewsFetcher(NewsFetcher):
         """
         adapted_texts = article.get('adapted_texts', {})
         if level in adapted_texts:
-            logger.info(f"Using cached adapted text for level {level}.")
+            metrics.ADAPTATION_CACHE.inc(result='hit')
+            logger.info("Using cached adapted text for level %s.", level, extra=HOT_PATH)
             return adapted_texts[level]
         else:
-            logger.info(f"Adapting full article text to level {level} on demand.")
+            metrics.ADAPTATION_CACHE.inc(result='miss')
+            logger.info("Adapting full article text to level %s on demand.", level)
             adapted_text = self.adapt_text_to_level(article['text'], level)
             if adapted_text:
                 adapted_texts[level] = adapted_text
-                article['adapted_texts'] = adapted_texts
-                # Save updated article to cache
-                with self.news_lock:
-                    self.save_cached_articles(self.cached_articles)
+                # Records are immutable: publish a snapshot with the updated record swapped in
+                updated = article.replace(adapted_texts=adapted_texts)
+                articles = [updated if cached is article else cached for cached in self.cached_articles]
+                self.save_cached_articles(articles)
+                self.publish_articles(articles)
                 return adapted_text
             else:
                 logger.error("Failed to adapt text to the specified level.")
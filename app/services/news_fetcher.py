@@ -3,16 +3,31 @@
 import abc
 import threading
 import time
+from urllib.parse import urlparse
+import requests
+from app.config import settings
+from app.models.NewsArticle import NewsArticle
+from app.services.body_store import get_body_store
+from app.services.duplicate_index import DuplicateIndex
+from app.utils import metrics
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 class NewsFetcher(abc.ABC):
+    source_name = None  # Short name used for the `source` field and the `source=` API filter
+
     def __init__(self):
         self.news_lock = threading.Lock()
         self.cached_articles = []
         self.cache_expiration_time = 3600*5  # 1 hour in seconds
         self.last_updated = 0
+        self.refresh_interval_hours = settings.NEWS_REFRESH_HOURS.get(self.source_name, 5)
+        self.refresh_on_read = True  # Disabled when another instance owns refreshing
+        self.snapshot_listeners = []
+        self.body_store = get_body_store()
+        self.progress = None  # RefreshProgress of the scheduled refresh running right now, if any
+        self._duplicate_index = None  # Loaded on the first refresh, not at startup
 
     def is_cache_valid(self):
         current_time = time.time()
@@ -47,6 +62,134 @@ class NewsFetcher(abc.ABC):
     def adapt_text_to_level(self, text, level):
         pass
 
+    def http_get(self, url):
+        """
+        GETs a page from a news site, recording latency and errors per host.
+        """
+        with metrics.track_upstream('scrape', urlparse(url).netloc):
+            response = requests.get(url)
+            response.raise_for_status()
+        return response
+
+    @property
+    def duplicate_index(self):
+        if self._duplicate_index is None:
+            self._duplicate_index = DuplicateIndex(
+                settings.DUPLICATE_INDEX_DIR / f"{self.source_name}.json", self.source_name
+            )
+        return self._duplicate_index
+
+    def adapt_reusing(self, text, level):
+        """
+        Adapts `text` like adapt_text_to_level, reusing the adaptation of an
+        identical text from an earlier refresh instead of calling the model again.
+        """
+        return self.duplicate_index.adapt(text, level, self.adapt_text_to_level)
+
+    def prepare_articles(self, articles):
+        """
+        Precomputes per-article learning content before a snapshot is published.
+        """
+        if settings.LEARNING_CONTENT_ENABLED and articles:
+            from app.services.learning_content import prepare_learning_content
+            prepare_learning_content(articles, self.cached_articles, self.openai_client)
+        return articles
+
+    def report_progress(self, event, count=1):
+        """
+        Counts an article as 'scraped', 'adapted' or 'failed' in the running refresh.
+        """
+        progress = self.progress
+        if progress is not None:
+            progress.add(event, count)
+
+    def record_refresh(self, started_at, articles):
+        metrics.record_refresh(self.source_name, time.perf_counter() - started_at, len(articles))
+
+    def source_fetchers(self):
+        """
+        Returns {source name: fetcher} for every source served by this fetcher.
+        """
+        return {self.source_name: self}
+
+    def sources(self):
+        """
+        Returns the names of the sources served by this fetcher.
+        """
+        return list(self.source_fetchers())
+
+    def get_source_articles(self, source=None):
+        """
+        Returns the cached articles, optionally restricted to a single source.
+        """
+        if source is None or source == self.source_name:
+            return self.get_cached_articles()
+        return []
+
+    def refresh_jobs(self):
+        """
+        Returns (source, callable, interval_hours) triples for the refresh scheduler.
+        """
+        return [(self.source_name, self.update_articles, self.refresh_interval_hours)]
+
+    def should_refresh_on_read(self):
+        return self.refresh_on_read and not self.is_cache_valid()
+
+    def set_refresh_on_read(self, enabled):
+        self.refresh_on_read = enabled
+
+    def export_snapshot(self):
+        """
+        Returns the current articles in a JSON-serialisable form for the shared snapshot store.
+        """
+        return [article.to_dict() for article in self.cached_articles]
+
+    def install_snapshot(self, snapshot):
+        """
+        Hot-swaps the cached articles for a snapshot published by another instance.
+        """
+        self.publish_articles(self.tag_source(snapshot))
+        self.last_updated = time.time()
+
+    def add_snapshot_listener(self, listener):
+        """
+        Registers `listener(source, articles)`, called with the current snapshot right
+        away and again every time a new snapshot replaces it.
+        """
+        self.snapshot_listeners.append(listener)
+        listener(self.source_name, self.cached_articles)
+
+    def publish_articles(self, articles):
+        """
+        Replaces the served snapshot with compact NewsArticle records built from the
+        given article dicts, lets the body store prune bodies no snapshot uses any
+        more, and notifies the snapshot listeners.
+        """
+        articles = [
+            article if isinstance(article, NewsArticle) else NewsArticle.from_dict(article, self.body_store)
+            for article in articles
+        ]
+        self.cached_articles = articles
+        self.body_store.retain(self.source_name, [key for article in articles for key in article.body_keys()])
+        for listener in self.snapshot_listeners:
+            try:
+                listener(self.source_name, articles)
+            except Exception:
+                logger.exception("Snapshot listener failed for source %s.", self.source_name)
+
+    def tag_source(self, articles):
+        """
+        Marks every article with the name of the source it was scraped from and
+        the key of its proxied image.
+        """
+        from app.services.image_cache import image_key
+
+        for article in articles:
+            article.setdefault('source', self.source_name)
+            if article.get('image_url'):
+                article.setdefault('image_key', image_key(article['image_url']))
+        return articles
+
     def format_article_text(self, text: str) -> str:
         """
         Formats the article text into HTML, assuming uppercase lines are headings.
@@ -1,18 +1,45 @@
 # app/services/news_fetcher_service.py
 
+import threading
 from app.config import settings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-def get_news_fetcher():
-    if settings.NEWS_FETCHER == 'nba':
+def create_source_fetcher(name):
+    if name == 'nba':
         from app.services.nba.nba_news_fetcher import NBANewsFetcher
         return NBANewsFetcher()
-    elif settings.NEWS_FETCHER == 'dw':
+    elif name == 'dw':
         from app.services.dw.dw_news_fetcher import DWNewsFetcher
         return DWNewsFetcher()
     else:
         raise ValueError("Invalid NEWS_FETCHER setting in configuration.")
 
-news_fetcher = get_news_fetcher()
\ No newline at end of file
+def create_news_fetcher():
+    if settings.NEWS_FETCHER == 'all':
+        names = ['nba', 'dw']
+    else:
+        names = [name.strip() for name in settings.NEWS_FETCHER.split(',') if name.strip()]
+
+    if len(names) == 1:
+        return create_source_fetcher(names[0])
+
+    from app.services.composite_news_fetcher import CompositeNewsFetcher
+    logger.info("Aggregating news sources: %s", ', '.join(names))
+    return CompositeNewsFetcher([create_source_fetcher(name) for name in names])
+
+_news_fetcher = None
+_news_fetcher_lock = threading.Lock()
+
+def get_news_fetcher():
+    """
+    Returns the process-wide news fetcher, built on first use rather than at import
+    (building it loads every source's cached articles).
+    """
+    global _news_fetcher
+    if _news_fetcher is None:
+        with _news_fetcher_lock:
+            if _news_fetcher is None:
+                _news_fetcher = create_news_fetcher()
+    return _news_fetcher
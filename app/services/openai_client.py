@@ -2,19 +2,38 @@
 import requests
 import json
 from app.config import settings
-from app.utils.logger import get_logger
+from app.utils import metrics
+from app.utils.logger import get_logger, HOT_PATH
 
 logger = get_logger(__name__)
 
 class OpenAIClient:
     def __init__(self):
         self.api_key = settings.OPENAI_API_KEY
-        self.base_url = "https://api.openai.com/v1/chat/completions"
+        self.base_url = f"{settings.OPENAI_BASE_URL}/chat/completions"
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
 
+    def _post(self, operation, data):
+        """
+        Sends a chat completion request and returns the decoded response.
+        Records latency, errors and estimated token spend per client method.
+        """
+        prompt_text = ''.join(message['content'] for message in data['messages'])
+        metrics.ESTIMATED_TOKENS.inc(self.get_token_count(prompt_text), operation=operation, direction='prompt')
+        with metrics.track_upstream('openai', operation):
+            response = requests.post(self.base_url, headers=self.headers, json=data)
+            response.raise_for_status()
+            result = response.json()
+        try:
+            completion_text = result['choices'][0]['message']['content'] or ''
+        except (KeyError, IndexError, TypeError):
+            completion_text = ''
+        metrics.ESTIMATED_TOKENS.inc(self.get_token_count(completion_text), operation=operation, direction='completion')
+        return result
+
     def adapt_text_with_prompt(self, prompt):
         """
         Uses OpenAI to process the text with a custom prompt.
@@ -28,49 +47,65 @@ class OpenAIClient:
 
         try:
             logger.info("Sending request to OpenAI API with custom prompt.")
-            response = requests.post(self.base_url, headers=self.headers, json=data)
-            response.raise_for_status()
-            result = response.json()
+            result = self._post('adapt_text_with_prompt', data)
             adapted_text = result['choices'][0]['message']['content'].strip()
             logger.info("Text processed successfully.")
             return adapted_text
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error processing text with custom prompt: {e}")
+            logger.error("Error processing text with custom prompt: %s", e)
             return None
         except KeyError as e:
-            logger.error(f"Unexpected response format from OpenAI API: {e}")
+            logger.error("Unexpected response format from OpenAI API: %s", e)
             return None
 
     def adapt_text_to_level(self, text, level):
         """
         Uses OpenAI to adapt the text to the user's German level (A1, A2, B1, etc.).
+        Texts longer than ADAPTATION_CHUNK_TOKENS are adapted in concurrent chunks.
         """
         if not text.strip():
             logger.warning("Empty text provided for adaptation.")
             return ''
 
-        prompt = (
+        if self.get_token_count(text) > settings.ADAPTATION_CHUNK_TOKENS:
+            from app.services.text_chunking import adapt_in_chunks
+            return adapt_in_chunks(self, text, level)
+        return self.adapt_text_segment(text, level)
+
+    def adapt_text_segment(self, text, level, context=None):
+        """
+        Adapts one text, or one chunk of a longer text, in a single completion.
+        `context` is the preceding part of the article, given for coherence only.
+        """
+        instructions = (
             f"Bitte passe den folgenden Text an das deutsche Niveau {level} an. "
-            "Antworte nur mit dem angepassten Text, ohne zusätzliche Erläuterungen oder Kommentare.\n\n"
-            f"{text}"
+            "Antworte nur mit dem angepassten Text, ohne zusätzliche Erläuterungen oder Kommentare."
         )
+        if context:
+            prompt = (
+                f"{instructions} Der Text ist ein Abschnitt eines längeren Artikels. Der vorherige Abschnitt "
+                "steht nur als Kontext hier; passe ihn nicht an und gib ihn nicht aus.\n\n"
+                f"Vorheriger Abschnitt:\n{context}\n\n"
+                f"Anzupassender Abschnitt:\n{text}"
+            )
+        else:
+            prompt = f"{instructions}\n\n{text}"
 
         data = {
             "model": "gpt-4o-mini",
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.7
         }
+        operation = 'adapt_text_segment' if context else 'adapt_text_to_level'
 
         try:
-            logger.info(f"Sending request to OpenAI API to adapt text to level {level}.")
-            response = requests.post(self.base_url, headers=self.headers, json=data)
-            response.raise_for_status()
-            result = response.json()
+            logger.info("Sending request to OpenAI API to adapt text to level %s.", level, extra=HOT_PATH)
+            result = self._post(operation, data)
             adapted_text = result['choices'][0]['message']['content']
-            logger.info("Text adapted successfully.")
+            logger.debug("Text adapted successfully.")
             return adapted_text.strip()
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error adapting text to level {level}: {e}")
+            logger.error("Error adapting text to level %s: %s", level, e)
             return None
 
     def extract_articles(self, prompt):
@@ -86,14 +121,12 @@ class OpenAIClient:
 
         try:
             logger.info("Sending request to OpenAI API to extract articles.")
-            response = requests.post(self.base_url, headers=self.headers, json=data)
-            response.raise_for_status()
-            result = response.json()
+            result = self._post('extract_articles', data)
             extracted_text = result['choices'][0]['message']['content'].strip()
             logger.info("Articles extracted successfully.")
             return extracted_text
         except requests.exceptions.RequestException as e:
-            logger.error(f"OpenAI API error during article extraction: {e}")
+            logger.error("OpenAI API error during article extraction: %s", e)
             return ''
 
     def extract_article_details(self, prompt):
@@ -109,14 +142,12 @@ class OpenAIClient:
 
         try:
             logger.info("Sending request to OpenAI API to extract article details.")
-            response = requests.post(self.base_url, headers=self.headers, json=data)
-            response.raise_for_status()
-            result = response.json()
+            result = self._post('extract_article_details', data)
             extracted_details = result['choices'][0]['message']['content'].strip()
             logger.info("Article details extracted successfully.")
             return extracted_details
         except requests.exceptions.RequestException as e:
-            logger.error(f"OpenAI API error during article details extraction: {e}")
+            logger.error("OpenAI API error during article details extraction: %s", e)
             return ''
 
     def get_token_count(self, text):
@@ -146,14 +177,12 @@ class OpenAIClient:
 
         try:
             logger.info("Sending request to OpenAI API for questions.")
-            response = requests.post(self.base_url, headers=self.headers, json=data)
-            response.raise_for_status()
-            result = response.json()
+            result = self._post('generate_questions', data)
             questions = result['choices'][0]['message']['content'].strip()
             logger.info("Questions received from OpenAI API.")
             return questions
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error generating questions: {e}")
+            logger.error("Error generating questions: %s", e)
             return None
 
     def generate_vocabulary(self, text: str) -> str:
@@ -172,14 +201,12 @@ class OpenAIClient:
 
         try:
             logger.info("Sending request to OpenAI API for vocabulary.")
-            response = requests.post(self.base_url, headers=self.headers, json=data)
-            response.raise_for_status()
-            result = response.json()
+            result = self._post('generate_vocabulary', data)
             vocabulary = result['choices'][0]['message']['content'].strip()
             logger.info("Vocabulary received from OpenAI API.")
             return vocabulary
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error generating vocabulary: {e}")
+            logger.error("Error generating vocabulary: %s", e)
             return None
 
     def generate_feedback(self, text: str, questions: str, user_answers: list) -> str:
@@ -200,14 +227,12 @@ class OpenAIClient:
 
         try:
             logger.info("Sending request to OpenAI API for feedback.")
-            response = requests.post(self.base_url, headers=self.headers, json=data)
-            response.raise_for_status()
-            result = response.json()
+            result = self._post('generate_feedback', data)
             feedback = result['choices'][0]['message']['content'].strip()
             logger.info("Feedback received from OpenAI API.")
             return feedback
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error generating feedback: {e}")
+            logger.error("Error generating feedback: %s", e)
             return None
 
     def shorten_title(self, title: str, max_length: int = 30) -> str:
@@ -231,14 +256,25 @@ class OpenAIClient:
         }
 
         try:
-            logger.info(f"Generating short title for: {title}")
-            response = requests.post(self.base_url, headers=self.headers, json=data)
-            response.raise_for_status()
-            result = response.json()
+            logger.info("Generating short title for: %s", title)
+            result = self._post('shorten_title', data)
             short_title = result['choices'][0]['message']['content'].strip()
-            logger.info(f"Short title generated: {short_title}")
+            logger.info("Short title generated: %s", short_title)
             return short_title
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error generating short title: {e}")
+            logger.error("Error generating short title: %s", e)
             # Fallback to truncating the title
             return title[:max_length] + "..."
+
+
+_openai_client = None
+
+
+def get_openai_client():
+    """
+    Returns the process-wide OpenAIClient shared by the fetchers and the API.
+    """
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAIClient()
+    return _openai_client
@@ -0,0 +1,192 @@
+# app/services/refresh_coordinator.py
+
+import threading
+import time
+from contextlib import contextmanager
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RefreshCoordinator:
+    """
+    Runs the news refresh on exactly one elected instance.
+
+    The leader scrapes and publishes versioned snapshots to the shared store;
+    every other instance only watches the store and hot-swaps new versions.
+    """
+
+    def __init__(self, news_fetcher, store, lease):
+        self.news_fetcher = news_fetcher
+        self.store = store
+        self.lease = lease
+        self.is_leader = False
+        self.version = 0
+        self.sync_lock = threading.Lock()
+        # Source jobs run concurrently; a snapshot exported before another job's refresh
+        # landed must not be published after it, or it would roll that source back
+        self.publish_lock = threading.Lock()
+        # Only the coordinator refreshes; reads must never trigger a scrape on a follower.
+        self.news_fetcher.set_refresh_on_read(False)
+
+    def start(self):
+        """
+        Elects a leader and makes sure there is a snapshot to serve.
+        """
+        self.sync()
+        if self.version == 0 and self.is_leader:
+            # A new store (e.g. a fresh container) still has the locally cached articles:
+            # publish those, and only scrape the sources that have nothing cached
+            empty = [fetcher for fetcher in self.news_fetcher.source_fetchers().values() if not fetcher.cached_articles]
+            if empty:
+                logger.info("No shared snapshot found; leader is refreshing %s.",
+                            ', '.join(fetcher.source_name for fetcher in empty))
+                with self.renewing_lease():
+                    for fetcher in empty:
+                        fetcher.update_articles()
+            else:
+                logger.info("No shared snapshot found; leader is publishing its cached articles.")
+            if self.confirm_leadership():
+                self.publish()
+
+    def sync(self):
+        """
+        Renews or acquires leadership and installs any newer snapshot from the store.
+        """
+        with self.sync_lock:
+            was_leader = self.is_leader
+            self.is_leader = self.lease.acquire()
+            if self.is_leader and not was_leader:
+                logger.info("This instance (%s) is now the refresh leader.", self.lease.holder_id)
+            elif was_leader and not self.is_leader:
+                logger.warning("Lost refresh leadership.")
+
+            latest = self.store.latest_version()
+            if latest > self.version:
+                version, snapshot = self.store.load(latest)
+                if snapshot is not None:
+                    self.news_fetcher.install_snapshot(snapshot)
+                    self.version = version
+                    logger.info("Installed shared snapshot version %s.", version)
+
+    def confirm_leadership(self):
+        """
+        Renews the lease right before acting as the leader. A refresh can outlast
+        the lease, and another instance may have taken over in the meantime.
+        """
+        was_leader = self.is_leader
+        self.is_leader = self.lease.acquire()
+        if was_leader and not self.is_leader:
+            logger.warning("Lost refresh leadership; stepping down.")
+        return self.is_leader
+
+    @contextmanager
+    def renewing_lease(self):
+        """
+        Renews a time-limited lease from a heartbeat thread while the block runs,
+        so a long refresh does not let the lease expire.
+        """
+        ttl = getattr(self.lease, 'ttl', None)
+        if not ttl:
+            yield  # Held until released, e.g. a FileLease
+            return
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(ttl / 3):
+                if not self.lease.acquire():
+                    self.is_leader = False
+                    logger.warning("Could not renew the refresh lease during a refresh.")
+                    return
+
+        thread = threading.Thread(target=heartbeat, name="LeaseHeartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def watch(self, interval, on_promoted=None):
+        """
+        Polls the store from a daemon thread on instances that do not run the scheduler.
+
+        If this instance becomes the leader, `on_promoted` is called once and the
+        watcher stops, since the leader's scheduler takes over syncing.
+        """
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sync()
+                except Exception as e:
+                    logger.error("Snapshot sync failed: %s", e)
+                    continue
+                if self.is_leader:
+                    if on_promoted is not None:
+                        on_promoted()
+                    return
+
+        threading.Thread(target=loop, name="SnapshotWatcher", daemon=True).start()
+
+    def publish(self):
+        with self.publish_lock:
+            self.version = self.store.publish(self.news_fetcher.export_snapshot())
+            return self.version
+
+    def leader_job(self, refresh_job):
+        """
+        Wraps a fetcher refresh job so it only runs on the leader and publishes its result.
+        The wrapped job returns False when it was skipped because this instance is not the leader.
+        """
+        def run():
+            if not self.lease.acquire():
+                self.is_leader = False
+                return False
+            self.is_leader = True
+            with self.renewing_lease():
+                refresh_job()
+            if not self.confirm_leadership():
+                return False  # Another instance took over; its refresh publishes instead
+            self.publish()
+            return True
+        return run
+
+    def refresh_jobs(self):
+        return [(source, self.leader_job(job), hours) for source, job, hours in self.news_fetcher.refresh_jobs()]
+
+    def stop(self):
+        if self.is_leader:
+            self.lease.release()
+            self.is_leader = False
+
+
+def get_refresh_coordinator(news_fetcher):
+    """
+    Returns the RefreshCoordinator: across instances sharing SNAPSHOT_DIR, or
+    otherwise across the workers of this machine through WORKER_SNAPSHOT_DIR.
+
+    The worker lease is taken even in a single process, since the number of
+    workers cannot be told reliably from here (WEB_CONCURRENCY may be unset when
+    a process manager starts them), and two schedulers must never run at once.
+    """
+    from pathlib import Path
+    from app.services.snapshot_store import SnapshotStore, MmapSnapshotStore
+    from app.services.leader_election import FileLease, SqliteLease
+
+    if not settings.SNAPSHOT_DIR:
+        # Workers on one machine: the first to lock the file owns the scheduler for its lifetime
+        snapshot_dir = Path(settings.WORKER_SNAPSHOT_DIR)
+        store = MmapSnapshotStore(snapshot_dir, keep=settings.SNAPSHOT_KEEP)
+        return RefreshCoordinator(news_fetcher, store, FileLease(snapshot_dir / 'scheduler.lock'))
+
+    snapshot_dir = Path(settings.SNAPSHOT_DIR)
+    store = SnapshotStore(snapshot_dir, keep=settings.SNAPSHOT_KEEP)
+    if settings.LEADER_LEASE == 'file':
+        lease = FileLease(snapshot_dir / 'leader.lock')
+    elif settings.LEADER_LEASE == 'sqlite':
+        lease = SqliteLease(snapshot_dir / 'leader.sqlite', ttl=settings.LEADER_LEASE_TTL)
+    else:
+        raise ValueError("Invalid LEADER_LEASE setting in configuration.")
+    return RefreshCoordinator(news_fetcher, store, lease)
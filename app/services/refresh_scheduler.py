@@ -0,0 +1,278 @@
+# app/services/refresh_scheduler.py
+
+import asyncio
+import random
+import threading
+import time
+from app.config import settings
+from app.utils import metrics
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROGRESS_EVENTS = ('scraped', 'adapted', 'failed')
+
+
+class RefreshProgress:
+    """
+    Live counters of one refresh run of one source.
+
+    Updated from the worker thread running the refresh (through
+    NewsFetcher.report_progress) and read by the admin API while it runs.
+    """
+
+    def __init__(self, source, trigger):
+        self.source = source
+        self.trigger = trigger  # 'schedule', 'manual' or 'startup'
+        self.state = 'running'  # then 'succeeded', 'empty', 'skipped' or 'failed'
+        self.counts = dict.fromkeys(PROGRESS_EVENTS, 0)
+        self.new_articles = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.revision = 0  # Bumped on every change, so progress streams can skip unchanged polls
+        self.lock = threading.Lock()
+
+    def add(self, event, count=1):
+        with self.lock:
+            self.counts[event] += count
+            self.revision += 1
+
+    def finish(self, state, new_articles=None):
+        with self.lock:
+            self.state = state
+            self.new_articles = new_articles
+            self.finished_at = time.time()
+            self.revision += 1
+
+    @property
+    def running(self):
+        return self.state == 'running'
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'source': self.source,
+                'trigger': self.trigger,
+                'state': self.state,
+                **self.counts,
+                'new_articles': self.new_articles,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+            }
+
+
+class SourceSchedule:
+    """
+    Scheduling state of one source: its job, current interval and change rate.
+    """
+
+    def __init__(self, source, job, interval_hours):
+        self.source = source
+        self.job = job
+        self.interval = interval_hours * 3600  # Seconds; adapted after every run
+        self.change_rate = None  # Moving average of new articles per second
+        self.last_success_at = None
+        self.next_run_at = None
+        self.current = None  # asyncio.Task of the running refresh, shared by overlapping triggers
+        self.progress = None  # RefreshProgress of the running or last run
+        self.wakeup = None  # asyncio.Event, created on the event loop by RefreshScheduler.start
+        self.task = None
+
+
+class RefreshScheduler:
+    """
+    Event-loop native scheduler for the per-source refresh jobs.
+
+    - Coalescing: a source never refreshes twice at once. Triggers that arrive
+      while it runs join the running refresh, and runs missed while the process
+      was busy or asleep collapse into a single run.
+    - Jitter: every delay is spread by +-`jitter` so instances and sources do not
+      hit the upstream sites in lockstep.
+    - Adaptive interval: the scheduler tracks how many new articles each source
+      publishes per hour and aims to run when about `target_new_articles` are
+      waiting. The interval stays between `min_interval` and `max_interval`
+      seconds. A source that stops changing is polled less often.
+
+    The blocking refresh jobs run in the default executor.
+    """
+
+    def __init__(self, news_fetcher, jobs, min_interval=None, max_interval=None, jitter=None,
+                 target_new_articles=None, smoothing=0.5):
+        self.news_fetcher = news_fetcher
+        self.min_interval = min_interval if min_interval is not None else settings.REFRESH_MIN_MINUTES * 60
+        self.max_interval = max_interval if max_interval is not None else settings.REFRESH_MAX_HOURS * 3600
+        self.jitter = jitter if jitter is not None else settings.REFRESH_JITTER
+        self.target_new_articles = target_new_articles or settings.REFRESH_TARGET_NEW_ARTICLES
+        self.smoothing = smoothing
+        self.schedules = {source: SourceSchedule(source, job, hours) for source, job, hours in jobs}
+        self.periodic_tasks = []
+        self.loop = None
+
+    def start(self, run_now=False):
+        """
+        Starts one task per source on the running event loop. Without `run_now`,
+        the first run of a source is due one interval after its articles were last
+        refreshed, so a restart does not re-scrape fresh articles.
+        """
+        self.loop = asyncio.get_running_loop()
+        now = time.time()
+        fetchers = self.news_fetcher.source_fetchers()
+        for source, schedule in self.schedules.items():
+            last_updated = getattr(fetchers.get(source), 'last_updated', 0)
+            schedule.last_success_at = last_updated or None
+            schedule.next_run_at = now if run_now or not last_updated else last_updated + self._jittered(schedule.interval)
+            schedule.wakeup = asyncio.Event()
+            schedule.task = asyncio.ensure_future(self._run_loop(schedule))
+            metrics.REFRESH_INTERVAL.set(schedule.interval, source=source)
+        logger.info("Refresh scheduler started for %s.", ', '.join(self.schedules))
+
+    def add_periodic(self, func, seconds):
+        """
+        Runs a blocking `func` every `seconds` (e.g. the snapshot sync on the refresh leader).
+        """
+        async def loop():
+            while True:
+                await asyncio.sleep(seconds)
+                try:
+                    await self.loop.run_in_executor(None, func)
+                except Exception:
+                    logger.exception("Periodic task %s failed.", getattr(func, '__name__', func))
+        self.periodic_tasks.append(asyncio.ensure_future(loop()))
+
+    def _jittered(self, interval):
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run_loop(self, schedule):
+        while True:
+            delay = schedule.next_run_at - time.time()
+            if delay > 0:
+                schedule.wakeup.clear()
+                try:
+                    await asyncio.wait_for(schedule.wakeup.wait(), delay)
+                    continue  # Rescheduled, e.g. by a manual run finishing; recompute the delay
+                except asyncio.TimeoutError:
+                    pass
+            await self._start_run(schedule, 'schedule')
+
+    def _start_run(self, schedule, trigger):
+        if schedule.current is None:
+            schedule.progress = RefreshProgress(schedule.source, trigger)
+            schedule.current = asyncio.ensure_future(self._execute(schedule, schedule.progress))
+        else:
+            logger.info("Refresh of %s already running; coalescing the %s trigger.", schedule.source, trigger)
+        return schedule.current
+
+    async def _execute(self, schedule, progress):
+        fetcher = self.news_fetcher.source_fetchers()[schedule.source]
+        before = fetcher.cached_articles
+        started_at = time.time()
+        fetcher.progress = progress
+        try:
+            result = await self.loop.run_in_executor(None, schedule.job)
+        except Exception:
+            logger.exception("Scheduled refresh of %s failed.", schedule.source)
+            progress.finish('failed')
+        else:
+            if result is False:
+                progress.finish('skipped')  # Not the refresh leader
+            elif fetcher.cached_articles is before:
+                progress.finish('empty')  # Nothing published, usually an upstream outage
+            else:
+                known = {article.get('url') for article in before}
+                new_articles = sum(1 for article in fetcher.cached_articles if article.get('url') not in known)
+                progress.finish('succeeded', new_articles)
+                self._adapt_interval(schedule, new_articles, started_at)
+        finally:
+            fetcher.progress = None
+            schedule.current = None
+            schedule.next_run_at = time.time() + self._jittered(schedule.interval)
+            schedule.wakeup.set()
+        logger.info("Refresh of %s %s: %s; next in %.0f minutes.", schedule.source, progress.state,
+                    progress.counts, (schedule.next_run_at - time.time()) / 60)
+        return progress
+
+    def _adapt_interval(self, schedule, new_articles, started_at):
+        if schedule.last_success_at is not None:
+            elapsed = max(started_at - schedule.last_success_at, 1.0)
+            rate = new_articles / elapsed
+            if schedule.change_rate is None:
+                schedule.change_rate = rate
+            else:
+                schedule.change_rate += self.smoothing * (rate - schedule.change_rate)
+            if schedule.change_rate > 0:
+                interval = self.target_new_articles / schedule.change_rate
+            else:
+                interval = self.max_interval
+            schedule.interval = min(self.max_interval, max(self.min_interval, interval))
+            metrics.REFRESH_INTERVAL.set(schedule.interval, source=schedule.source)
+        schedule.last_success_at = started_at
+
+    def trigger(self, sources=None):
+        """
+        Starts a refresh of the given sources (all by default) now, joining any
+        refresh that is already running. Must be called on the event loop.
+        Returns the RefreshProgress of each run.
+        """
+        sources = list(self.schedules) if sources is None else sources
+        runs = []
+        for source in sources:
+            schedule = self.schedules[source]
+            self._start_run(schedule, 'manual')
+            runs.append(schedule.progress)
+        return runs
+
+    async def run(self, sources=None, trigger='manual'):
+        """
+        Like trigger(), but waits for the runs to finish.
+        """
+        tasks = [self._start_run(self.schedules[source], trigger) for source in (sources or list(self.schedules))]
+        return await asyncio.gather(*tasks)
+
+    def progress(self, sources=None):
+        """
+        Returns the RefreshProgress of the running or last run of each source that has one.
+        """
+        sources = list(self.schedules) if sources is None else sources
+        return [self.schedules[source].progress for source in sources if self.schedules[source].progress is not None]
+
+    def status(self):
+        now = time.time()
+        return {
+            source: {
+                'running': schedule.current is not None,
+                'interval_seconds': round(schedule.interval),
+                'next_run_in_seconds': max(0, round(schedule.next_run_at - now)) if schedule.next_run_at else None,
+                'new_articles_per_hour': (
+                    round(schedule.change_rate * 3600, 3) if schedule.change_rate is not None else None
+                ),
+                'last_run': schedule.progress.to_dict() if schedule.progress is not None else None,
+            }
+            for source, schedule in self.schedules.items()
+        }
+
+    def stop(self):
+        for task in [schedule.task for schedule in self.schedules.values()] + self.periodic_tasks:
+            if task is not None:
+                task.cancel()
+        self.periodic_tasks = []
+        logger.info("Refresh scheduler stopped.")
+
+
+_refresh_scheduler = None
+
+
+def start_refresh_scheduler(news_fetcher, jobs, run_now=False):
+    """
+    Creates and starts the process-wide RefreshScheduler on the running event loop.
+    """
+    global _refresh_scheduler
+    _refresh_scheduler = RefreshScheduler(news_fetcher, jobs)
+    _refresh_scheduler.start(run_now=run_now)
+    return _refresh_scheduler
+
+
+def get_refresh_scheduler():
+    """
+    Returns the running RefreshScheduler, or None on instances that do not refresh.
+    """
+    return _refresh_scheduler
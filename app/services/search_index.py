@@ -0,0 +1,165 @@
+# app/services/search_index.py
+
+import heapq
+import math
+import re
+import threading
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SEARCH_FIELDS = {  # field -> weight (term frequency multiplier)
+    'title': 2,
+    'adapted_title': 2,
+    'teaser': 1,
+    'adapted_teaser': 1,
+    'text': 1,
+}
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+UMLAUT_TABLE = str.maketrans({'ä': 'a', 'ö': 'o', 'ü': 'u', 'ß': 'ss'})
+
+STOPWORDS = frozenset((
+    'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einen', 'einem', 'einer', 'eines',
+    'und', 'oder', 'aber', 'als', 'am', 'an', 'auf', 'aus', 'bei', 'bis', 'im', 'in', 'ist', 'mit',
+    'nach', 'nicht', 'noch', 'sich', 'sie', 'er', 'es', 'so', 'um', 'uber', 'von', 'vor', 'war',
+    'wie', 'wir', 'zu', 'zum', 'zur', 'hat', 'haben', 'wird', 'werden', 'auch', 'dass', 'fur',
+))
+
+# Light German stemming: longest suffix first, keeping at least MIN_STEM characters
+SUFFIXES = ('ern', 'em', 'en', 'er', 'es', 'e', 'n', 's')
+MIN_STEM = 3
+
+
+def normalize_token(token):
+    """
+    Case-folds and strips umlauts/ß, so 'Größe', 'GRÖSSE' and 'grosse' are one term.
+    """
+    return token.casefold().translate(UMLAUT_TABLE)
+
+
+def stem(token):
+    if not token.isascii():
+        return token  # Only stem Latin-script words; Cyrillic titles are matched verbatim
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    terms = []
+    for token in TOKEN_PATTERN.findall(text or ''):
+        token = normalize_token(token)
+        if token in STOPWORDS:
+            continue
+        terms.append(stem(token))
+    return terms
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over the served articles, ranked with BM25.
+
+    Updated incrementally from snapshot listeners: only articles that are new or
+    whose text changed are (re)indexed, and articles that left the snapshot are
+    removed. Articles are identified by URL.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.lock = threading.Lock()
+        self.postings = {}  # term -> {doc_id: weighted term frequency}
+        self.doc_lengths = {}  # doc_id -> weighted document length
+        self.docs = {}  # doc_id -> (source, url, fingerprint, terms)
+        self.doc_ids = {}  # url -> doc_id
+        self.source_docs = {}  # source -> set of doc_ids
+        self.total_length = 0
+        self.next_doc_id = 0
+
+    def _document_terms(self, article):
+        counts = {}
+        for field, weight in SEARCH_FIELDS.items():
+            for term in tokenize(article.get(field)):
+                counts[term] = counts.get(term, 0) + weight
+        return counts
+
+    def _fingerprint(self, article):
+        return hash(tuple(article.get(field) or '' for field in SEARCH_FIELDS))
+
+    def _remove(self, doc_id):
+        source, url, _, terms = self.docs.pop(doc_id)
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        self.doc_ids.pop(url, None)
+        self.source_docs[source].discard(doc_id)
+
+    def _add(self, source, url, fingerprint, article):
+        doc_id = self.next_doc_id
+        self.next_doc_id += 1
+        terms = self._document_terms(article)
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+        length = sum(terms.values())
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        self.docs[doc_id] = (source, url, fingerprint, terms)
+        self.doc_ids[url] = doc_id
+        self.source_docs.setdefault(source, set()).add(doc_id)
+
+    def update_source(self, source, articles):
+        """
+        Brings the index in line with a newly published snapshot of one source.
+        """
+        with self.lock:
+            seen = set()
+            added = removed = 0
+            for article in articles:
+                url = article.get('url')
+                if not url or url in seen:
+                    continue
+                seen.add(url)
+                fingerprint = self._fingerprint(article)
+                doc_id = self.doc_ids.get(url)
+                if doc_id is not None:
+                    if self.docs[doc_id][2] == fingerprint and self.docs[doc_id][0] == source:
+                        continue
+                    self._remove(doc_id)
+                    removed += 1
+                self._add(source, url, fingerprint, article)
+                added += 1
+            for doc_id in [d for d in self.source_docs.get(source, ()) if self.docs[d][1] not in seen]:
+                self._remove(doc_id)
+                removed += 1
+        if added or removed:
+            logger.info("Search index updated for %s: %s indexed, %s removed.", source, added, removed)
+
+    def search(self, query, limit=20, source=None):
+        """
+        Returns up to `limit` (url, score) pairs, best match first.
+        """
+        terms = set(tokenize(query))
+        with self.lock:
+            doc_count = len(self.docs)
+            if not terms or not doc_count:
+                return []
+            average_length = self.total_length / doc_count
+            scores = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+            if source is not None:
+                allowed = self.source_docs.get(source, set())
+                scores = {doc_id: score for doc_id, score in scores.items() if doc_id in allowed}
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(self.docs[doc_id][1], score) for doc_id, score in best]
@@ -0,0 +1,147 @@
+# app/services/snapshot_store.py
+
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_FILE_PATTERN = re.compile(r'^snapshot-(\d+)\.(?:json|bin)$')
+
+
+class SnapshotStore:
+    """
+    Versioned article snapshots in a directory shared by all instances.
+
+    Every publish writes a new immutable `snapshot-<version>.json` and then
+    atomically moves the `LATEST` pointer, so readers never see a partial file.
+    """
+
+    suffix = 'json'
+
+    def __init__(self, directory, keep=5):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.latest_path = self.directory / 'LATEST'
+        self.keep = keep
+
+    def _snapshot_path(self, version):
+        return self.directory / f"snapshot-{version:015d}.{self.suffix}"
+
+    def _write_atomic(self, path, content):
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        mode, encoding = ('wb', None) if isinstance(content, bytes) else ('w', 'utf-8')
+        with open(tmp_path, mode, encoding=encoding) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def latest_version(self):
+        try:
+            return int(self.latest_path.read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _set_latest_version(self, version):
+        self._write_atomic(self.latest_path, str(version))
+
+    def _encode(self, data):
+        return json.dumps(data, ensure_ascii=False)
+
+    def _read_snapshot(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def publish(self, data):
+        """
+        Stores a new snapshot and returns its version.
+        """
+        # Millisecond timestamps keep versions increasing even if a lease hand-over overlaps a publish.
+        version = max(self.latest_version() + 1, int(time.time() * 1000))
+        self._write_atomic(self._snapshot_path(version), self._encode(data))
+        self._set_latest_version(version)
+        logger.info("Published snapshot version %s.", version)
+        self.prune()
+        return version
+
+    def load(self, version=None):
+        """
+        Returns (version, data) for the given version, or the latest one. Returns (0, None) if empty.
+        """
+        if version is None:
+            version = self.latest_version()
+        if not version:
+            return 0, None
+        try:
+            return version, self._read_snapshot(self._snapshot_path(version))
+        except (FileNotFoundError, ValueError) as e:
+            logger.error("Could not load snapshot version %s: %s", version, e)
+            return 0, None
+
+    def versions(self):
+        found = []
+        for path in self.directory.iterdir():
+            match = SNAPSHOT_FILE_PATTERN.match(path.name)
+            if match:
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def prune(self):
+        for version in self.versions()[:-self.keep]:
+            try:
+                self._snapshot_path(version).unlink()
+            except FileNotFoundError:
+                pass
+
+
+class MmapSnapshotStore(SnapshotStore):
+    """
+    Snapshot store for uvicorn workers on one machine.
+
+    The current version lives in a small memory-mapped header that the owner
+    updates in place, so readers can check for a new snapshot on every poll
+    without a syscall. Snapshot bodies are mapped read-only from the page cache
+    shared by all workers.
+    """
+
+    suffix = 'bin'
+    HEADER_FORMAT = '<8sQ'  # magic, version
+    HEADER_MAGIC = b'DSNAPv1\0'
+
+    def __init__(self, directory, keep=5):
+        super().__init__(directory, keep=keep)
+        self.header_path = self.directory / 'HEADER'
+        header_size = struct.calcsize(self.HEADER_FORMAT)
+        fd = os.open(self.header_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < header_size:
+                os.ftruncate(fd, header_size)
+            self._header = mmap.mmap(fd, header_size)
+        finally:
+            os.close(fd)
+        if self._header[:8] != self.HEADER_MAGIC:
+            struct.pack_into(self.HEADER_FORMAT, self._header, 0, self.HEADER_MAGIC, 0)
+
+    def latest_version(self):
+        magic, version = struct.unpack_from(self.HEADER_FORMAT, self._header, 0)
+        return version if magic == self.HEADER_MAGIC else 0
+
+    def _set_latest_version(self, version):
+        # An aligned 8-byte store, so readers see either the old or the new version.
+        struct.pack_into('<Q', self._header, 8, version)
+        self._header.flush()
+
+    def _encode(self, data):
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def _read_snapshot(self, path):
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return json.loads(mapped[:])
@@ -0,0 +1,205 @@
+# app/services/text_chunking.py
+
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?…])\s+')
+HEADING_MAX_WORDS = 12
+# Balanced chunks may run this much over the average size before a new chunk is started
+BALANCE_SLACK = 1.15
+
+
+def split_blocks(text):
+    """
+    Splits text into paragraphs and headings, one per non-empty line, the same
+    way NewsFetcher.format_article_text reads it.
+    """
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+
+def is_heading(block):
+    """
+    Uppercase lines (the convention of format_article_text) and short lines
+    without closing punctuation, like the subheadings scraped from DW pages.
+    """
+    if block.isupper():
+        return True
+    return len(block.split()) <= HEADING_MAX_WORDS and block[-1] not in '.!?…:;,"“”»«)'
+
+
+def _split_long_block(block, token_budget, count_tokens, char_limit):
+    """
+    Splits a paragraph longer than the budget on sentence boundaries, and a
+    single oversized sentence on word boundaries.
+    """
+    pieces = []
+    for sentence in SENTENCE_END_PATTERN.split(block):
+        if count_tokens(sentence) <= token_budget:
+            pieces.append(sentence)
+            continue
+        limit = char_limit(token_budget)
+        while len(sentence) > limit:
+            cut = sentence.rfind(' ', 0, limit)
+            cut = cut if cut > 0 else limit
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def _join(units):
+    text = ''
+    for unit, continues_paragraph in units:
+        if text:
+            text += ' ' if continues_paragraph else '\n'
+        text += unit
+    return text
+
+
+def split_into_chunks(text, token_budget, count_tokens, char_limit):
+    """
+    Splits `text` into chunks of at most `token_budget` tokens, cutting between
+    paragraphs where possible, then between sentences. A heading is never left at
+    the end of a chunk, away from the paragraph it introduces.
+
+    Chunks are balanced: the budget is lowered to about the average chunk size, so
+    the last chunk is not a small remainder and every chunk takes about as long.
+    """
+    units = []  # (text, continues the previous paragraph)
+    for block in split_blocks(text):
+        if count_tokens(block) <= token_budget:
+            units.append((block, False))
+        else:
+            pieces = _split_long_block(block, token_budget, count_tokens, char_limit)
+            units.extend((piece, index > 0) for index, piece in enumerate(pieces))
+
+    total = sum(count_tokens(unit) for unit, _ in units)
+    chunk_count = max(1, math.ceil(total / token_budget))
+    target = min(token_budget, math.ceil(total / chunk_count * BALANCE_SLACK))
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for unit in units:
+        tokens = count_tokens(unit[0])
+        if current and current_tokens + tokens > target:
+            carried = []
+            while len(current) > 1 and not current[-1][1] and is_heading(current[-1][0]):
+                carried.insert(0, current.pop())
+            chunks.append(_join(current))
+            current = carried
+            current_tokens = sum(count_tokens(unit_text) for unit_text, _ in carried)
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        chunks.append(_join(current))
+    return chunks
+
+
+def _tail_sentences(block, token_budget, count_tokens, char_limit):
+    sentences = SENTENCE_END_PATTERN.split(block)
+    tail = ''
+    for sentence in reversed(sentences):
+        candidate = f"{sentence} {tail}".strip()
+        if count_tokens(candidate) > token_budget:
+            break
+        tail = candidate
+    if tail:
+        return tail
+    # No whole sentence fits: fall back to the last words
+    limit = char_limit(token_budget)
+    cut = block.find(' ', len(block) - limit)
+    return block[cut + 1:] if cut >= 0 else block[-limit:]
+
+
+def overlap_context(chunk, token_budget, count_tokens, char_limit):
+    """
+    Returns the end of `chunk`, about `token_budget` tokens of whole paragraphs
+    (or the tail of the last one), shown to the model as context for the next chunk.
+    """
+    tail = []
+    tokens = 0
+    for block in reversed(split_blocks(chunk)):
+        block_tokens = count_tokens(block)
+        if tail and tokens + block_tokens > token_budget:
+            break
+        if block_tokens > token_budget:
+            block = _tail_sentences(block, token_budget, count_tokens, char_limit)
+        tail.insert(0, block)
+        tokens += block_tokens
+    return '\n'.join(tail)
+
+
+def adapt_in_chunks(openai_client, text, level, token_budget=None, overlap_tokens=None, workers=None):
+    """
+    Adapts a long text in budget-sized chunks, concurrently, and reassembles the
+    adapted chunks in order. Each chunk is sent with the end of the chunk before it
+    as read-only context, so wording and references stay coherent across cuts.
+
+    Returns None if a chunk still fails after one retry, like a failed single call.
+    """
+    token_budget = token_budget or settings.ADAPTATION_CHUNK_TOKENS
+    overlap_tokens = settings.ADAPTATION_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+    workers = workers or settings.ADAPTATION_WORKERS
+    count_tokens = openai_client.get_token_count
+    char_limit = openai_client.get_char_limit_for_tokens
+
+    chunks = split_into_chunks(text, token_budget, count_tokens, char_limit)
+    contexts = [None] + [
+        overlap_context(chunk, overlap_tokens, count_tokens, char_limit) if overlap_tokens else None
+        for chunk in chunks[:-1]
+    ]
+    logger.info("Adapting %s-token text to level %s in %s chunks.", count_tokens(text), level, len(chunks))
+
+    def adapt(index):
+        return openai_client.adapt_text_segment(chunks[index], level, contexts[index])
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as executor:
+        adapted = list(executor.map(adapt, range(len(chunks))))
+
+    for index, result in enumerate(adapted):
+        if not result:
+            logger.warning("Retrying chunk %s of %s.", index + 1, len(chunks))
+            adapted[index] = adapt(index)
+            if not adapted[index]:
+                logger.error("Chunked adaptation to level %s failed at chunk %s.", level, index + 1)
+                return None
+    return '\n\n'.join(adapted)
+
+
+def split_into_segments(text, max_chars):
+    """
+    Splits text into speech segments of at most `max_chars` characters.
+
+    Every paragraph starts a new segment and long paragraphs are cut between
+    sentences, so editing one paragraph never moves the boundaries of the
+    segments around it.
+    """
+    segments = []
+    for block in split_blocks(text):
+        current = ''
+        for sentence in SENTENCE_END_PATTERN.split(block):
+            while len(sentence) > max_chars:  # A single run-on sentence: cut on a word boundary
+                cut = sentence.rfind(' ', 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                if current:
+                    segments.append(current)
+                    current = ''
+                segments.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+            if not sentence:
+                continue
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                segments.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            segments.append(current)
+    return segments
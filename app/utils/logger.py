@@ -1,10 +1,118 @@
 # app/utils/logger.py
+import atexit
+import contextvars
+import datetime
+import json
 import logging
+import logging.handlers
+import queue
+import sys
+import threading
 from app.config import settings
 
+# Correlation ID of the request being handled, set by the request middleware
+request_id_var = contextvars.ContextVar('request_id', default=None)
+
+# Pass as `extra=HOT_PATH` on messages logged for every request or snippet;
+# only one in LOG_SAMPLE_EVERY of them is emitted.
+HOT_PATH = {'sample_every': settings.LOG_SAMPLE_EVERY}
+
+_configure_lock = threading.Lock()
+_listener = None
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamps records with the current request ID. Runs in the calling thread,
+    before the record is handed to the background writer.
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in `sample_every` records for messages that opt in through `extra`.
+    Counted per logger and message template, so arguments do not split the count.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        every = getattr(record, 'sample_every', 1)
+        if every <= 1:
+            return True
+        key = (record.name, record.msg)
+        with self.lock:
+            count = self.counts.get(key, 0)
+            self.counts[key] = count + 1
+        return count % every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            entry['request_id'] = request_id
+        if getattr(record, 'sample_every', 1) > 1:
+            entry['sampled'] = record.sample_every
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues the record as-is: message formatting happens on the listener thread,
+    so request threads never pay for it or block on stdout.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging():
+    """
+    Configures the root logger once per process: records go through a queue to a
+    background thread that writes them to stdout.
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        if settings.LOG_FORMAT == 'json':
+            stream_handler.setFormatter(JsonFormatter())
+        else:
+            stream_handler.setFormatter(logging.Formatter(
+                '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'))
+
+        queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(RequestContextFilter())
+        queue_handler.addFilter(SamplingFilter())
+
+        root = logging.getLogger()
+        root.handlers[:] = [queue_handler]
+        root.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
+
+        _listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
 def get_logger(name):
-    logging.basicConfig(
-        level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
-    )
+    configure_logging()
     logger = logging.getLogger(name)
-    return logger
\ No newline at end of file
+    return logger
@@ -0,0 +1,208 @@
+# app/utils/metrics.py
+"""
+Minimal Prometheus-style metrics, rendered in the text exposition format by /metrics.
+
+Values are kept per process; with several uvicorn workers each worker reports its own.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Metric:
+    kind = 'untyped'
+    initial = None  # Value of an unlabelled metric before its first update, so it is exported from the start
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+        if not self.labelnames and self.initial is not None:
+            self.values[()] = self.initial
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        with self.lock:
+            return [(self.name, key, (), value) for key, value in self.values.items()]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, extra, value in self.samples():
+            lines.append(f"{name}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    kind = 'counter'
+    initial = 0
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+    initial = 0
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.function = None
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function):
+        """
+        Computes the gauge at scrape time. `function` returns a number, or a
+        {label values tuple: number} dict for labelled gauges.
+        """
+        self.function = function
+
+    def samples(self):
+        if self.function is None:
+            return super().samples()
+        result = self.function()
+        if not isinstance(result, dict):
+            result = {(): result}
+        return [(self.name, tuple(str(v) for v in key), (), value) for key, value in result.items()]
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        samples = []
+        with self.lock:
+            for key, (counts, total, count) in self.values.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    samples.append((f"{self.name}_bucket", key, (('le', _format_value(bound)),), cumulative))
+                samples.append((f"{self.name}_bucket", key, (('le', '+Inf'),), count))
+                samples.append((f"{self.name}_sum", key, (), total))
+                samples.append((f"{self.name}_count", key, (), count))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        return '\n'.join(metric.render() for metric in self.metrics) + '\n'
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route.', ['method', 'route', 'status']))
+UPSTREAM_LATENCY = registry.register(Histogram(
+    'upstream_request_duration_seconds', 'Latency of calls to OpenAI, TTS and scraped sites.', ['service', 'operation']))
+UPSTREAM_ERRORS = registry.register(Counter(
+    'upstream_request_errors_total', 'Failed calls to OpenAI, TTS and scraped sites.', ['service', 'operation']))
+ADAPTATION_CACHE = registry.register(Counter(
+    'adaptation_cache_requests_total', 'Lookups of precomputed adapted texts.', ['result']))
+REFRESH_DURATION = registry.register(Histogram(
+    'refresh_duration_seconds', 'Duration of update_articles runs.', ['source']))
+REFRESH_ARTICLES = registry.register(Gauge(
+    'refresh_articles', 'Articles fetched by the last update_articles run.', ['source']))
+REFRESH_INTERVAL = registry.register(Gauge(
+    'refresh_interval_seconds', 'Current adaptive refresh interval.', ['source']))
+REFRESH_RUNS = registry.register(Counter(
+    'refresh_runs_total', 'update_articles runs by outcome.', ['source', 'outcome']))
+SNAPSHOT_AGE = registry.register(Gauge(
+    'snapshot_age_seconds', 'Seconds since the served snapshot was refreshed.', ['source']))
+TTS_STREAMS_IN_FLIGHT = registry.register(Gauge(
+    'tts_streams_in_flight', 'Audio responses currently being generated or streamed.'))
+TTS_SEGMENT_CACHE = registry.register(Counter(
+    'tts_segment_cache_requests_total', 'Lookups of synthesized long-form speech segments.', ['result']))
+DUPLICATE_ARTICLES = registry.register(Counter(
+    'duplicate_articles_total', 'Scraped articles collapsed into a near-duplicate.', ['source']))
+ADAPTATION_REUSE = registry.register(Counter(
+    'adaptation_reuse_requests_total', 'Refresh-time adaptations looked up by exact text.', ['source', 'result']))
+ESTIMATED_TOKENS = registry.register(Counter(
+    'openai_estimated_tokens_total', 'Estimated OpenAI tokens spent (get_token_count).', ['operation', 'direction']))
+
+
+@contextmanager
+def track_upstream(service, operation):
+    """
+    Times an upstream call and counts it as an error if it raises.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.inc(service=service, operation=operation)
+        raise
+    finally:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, service=service, operation=operation)
+
+
+def record_refresh(source, duration, article_count):
+    REFRESH_DURATION.observe(duration, source=source)
+    REFRESH_ARTICLES.set(article_count, source=source)
+    REFRESH_RUNS.inc(source=source, outcome='success' if article_count else 'empty')
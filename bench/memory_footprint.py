@@ -0,0 +1,124 @@
+# bench/memory_footprint.py
+"""
+Resident-memory footprint of the article cache: plain dicts vs NewsArticle records.
+
+Synthesizes snapshots of the requested sizes from news_articles.json (every copy
+gets its own URL, title and text so nothing is shared by accident), then measures
+with tracemalloc how many bytes per article each representation keeps alive:
+
+    dicts          the article dicts as json.load returns them (previous behaviour)
+    records        NewsArticle records with bodies held inline
+    records+store  NewsArticle records with long bodies in the on-disk body store
+
+Usage (from the repository root):
+    python -m bench.memory_footprint --sizes 1000 10000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench.run_benchmarks import RESULTS_DIR, git_revision
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def filler(seed, length):
+    seed = seed or 'Lorem ipsum dolor sit amet.'
+    return (seed + ' ') * (length // (len(seed) + 1) + 1)
+
+
+def synthesize(template, count, body_chars):
+    """
+    Returns `count` JSON-encoded articles derived from the fixture articles. Articles
+    without a body (the NBA fixture only has list data) get a `body_chars` long text
+    and an adapted A1 version, so body storage is part of the measurement.
+    """
+    articles = []
+    for i in range(count):
+        article = dict(template[i % len(template)])
+        suffix = f" #{i}"
+        article['url'] = f"{article['url']}?copy={i}"
+        article['title'] = article['title'] + suffix
+        text = article.get('text') or filler(article.get('teaser'), body_chars)[:body_chars]
+        adapted_texts = article.get('adapted_texts') or {'A1': filler(article.get('adapted_teaser'), body_chars // 2)[:body_chars // 2]}
+        article['text'] = text + suffix
+        article['adapted_texts'] = {level: value + suffix for level, value in adapted_texts.items()}
+        article['source'] = 'nba'
+        articles.append(article)
+    return json.dumps(articles, ensure_ascii=False)
+
+
+def measure(build, payload):
+    """
+    Bytes still allocated after build(payload), i.e. what the cache would keep resident.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    articles = build(payload)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del articles
+    return retained
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help="Snapshot sizes to measure")
+    parser.add_argument('--body-chars', type=int, default=4000, help="Body length for fixture articles without text")
+    parser.add_argument('--fixture', type=Path, default=REPO_ROOT / 'news_articles.json', help="Articles to copy")
+    parser.add_argument('--output', type=Path, help="Result file (default: bench/results/<timestamp>-<rev>-memory.json)")
+    args = parser.parse_args(argv)
+
+    # Must run before anything under app/ is imported: settings are read at import time.
+    workdir = Path(tempfile.mkdtemp(prefix='deutschify-memory-'))
+    os.environ.update({'BODY_STORE_DIR': str(workdir / 'bodies'), 'LOG_LEVEL': 'WARNING'})
+
+    from app.models.NewsArticle import NewsArticle
+    from app.services.body_store import get_body_store
+
+    body_store = get_body_store()
+    template = json.loads(args.fixture.read_text(encoding='utf-8'))
+    builders = {
+        'dicts': json.loads,
+        'records': lambda payload: [NewsArticle.from_dict(a) for a in json.loads(payload)],
+        'records+store': lambda payload: [NewsArticle.from_dict(a, body_store) for a in json.loads(payload)],
+    }
+
+    sizes = {}
+    for count in args.sizes:
+        payload = synthesize(template, count, args.body_chars)
+        sizes[count] = {}
+        for name, build in builders.items():
+            retained = measure(build, payload)
+            sizes[count][name] = {'bytes': retained, 'bytes_per_article': round(retained / count)}
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'fixture_articles': len(template),
+        'body_chars': args.body_chars,
+        'body_inline_limit': body_store.inline_limit,
+        'sizes': sizes,
+    }
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        output = RESULTS_DIR / f"{stamp}-{results['revision'] or 'unknown'}-memory.json"
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
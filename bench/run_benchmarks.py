@@ -0,0 +1,238 @@
+# bench/run_benchmarks.py
+"""
+Offline end-to-end benchmark against local stand-ins for slamdunk.ru, dw.com and OpenAI.
+
+Measures, per source, the wall time and upstream call count of a full
+update_articles run, the parse time of each page type, and p50/p99 latency of the
+Android API endpoints under concurrent load. Results are written as JSON so runs
+of different versions can be compared.
+
+Usage (from the repository root):
+    python -m bench.run_benchmarks --chat-latency 0.2 --tts-latency 0.5 --error-rate 0.01
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench.stubs import SlamdunkStub, DWStub, OpenAIStub, NBA_LIST_FIXTURE, NBA_DETAIL_FIXTURE
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile of `values` for q in [0, 100].
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(durations):
+    return {
+        'count': len(durations),
+        'mean': statistics.fmean(durations) if durations else None,
+        'p50': percentile(durations, 50),
+        'p99': percentile(durations, 99),
+        'max': max(durations) if durations else None,
+    }
+
+
+def time_repeated(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+def configure_environment(args, slamdunk, dw, openai, workdir):
+    # Must run before anything under app/ is imported: settings are read at import time.
+    os.environ.update({
+        'NBA_NEWS_URL': slamdunk.news_url,
+        'DW_BASE_URL': dw.url,
+        'DW_NEWS_URL': dw.news_url,
+        'OPENAI_BASE_URL': openai.url,
+        'OPENAI_API_KEY': 'benchmark',
+        'NEWS_FETCHER': args.sources,
+        'NEWS_JSON_PATH': str(workdir / 'news_articles.json'),
+        'NEWS_JSON_PATH_DW': str(workdir / 'news_articles_dw.json'),
+        'IMAGE_CACHE_DIR': str(workdir / 'images'),
+        'IMAGE_PREFETCH': 'false',  # Fixture image URLs point at the real CDNs
+        'BODY_STORE_DIR': str(workdir / 'bodies'),
+        'DUPLICATE_INDEX_DIR': str(workdir / 'duplicates'),
+        'TTS_CACHE_DIR': str(workdir / 'tts'),
+        'WORKER_SNAPSHOT_DIR': str(workdir / 'snapshots'),
+        'LOG_LEVEL': 'WARNING',
+        'WEB_CONCURRENCY': '1',
+    })
+    os.environ.pop('SNAPSHOT_DIR', None)
+
+
+def bench_parsing(news_fetcher, dw, repeat):
+    results = {}
+    fetchers = news_fetcher.source_fetchers()
+    if 'nba' in fetchers:
+        nba = fetchers['nba']
+        list_page = NBA_LIST_FIXTURE.read_bytes()
+        detail_page = NBA_DETAIL_FIXTURE.read_bytes()
+        results['nba_list'] = time_repeated(lambda: nba.parse_news_list(list_page), repeat)
+        results['nba_detail'] = time_repeated(lambda: nba.parse_article_details(detail_page, 'fixture'), repeat)
+    if 'dw' in fetchers:
+        dw_fetcher = fetchers['dw']
+        path, _ = next(iter(dw.articles.items()))
+        with urllib.request.urlopen(dw.news_url) as response:
+            list_page = response.read().decode('utf-8')
+        with urllib.request.urlopen(dw.url + path) as response:
+            detail_page = response.read().decode('utf-8')
+        results['dw_list'] = time_repeated(lambda: dw_fetcher.parse_article_urls(list_page), repeat)
+        results['dw_detail'] = time_repeated(lambda: dw_fetcher.parse_article_details(detail_page, dw.url + path), repeat)
+    return results
+
+
+def bench_refresh(news_fetcher, stubs):
+    results = {}
+    for source, fetcher in news_fetcher.source_fetchers().items():
+        for stub in stubs.values():
+            stub.reset_calls()
+        start = time.perf_counter()
+        fetcher.update_articles()
+        wall_time = time.perf_counter() - start
+        results[source] = {
+            'wall_time': wall_time,
+            'articles': len(fetcher.cached_articles),
+            'upstream_calls': {name: dict(stub.calls) for name, stub in stubs.items()},
+        }
+    return results
+
+
+def start_api_server(app):
+    import uvicorn
+
+    config = uvicorn.Config(app, host='127.0.0.1', port=0, log_level='warning', lifespan='on')
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, name='BenchmarkServer', daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("API server failed to start")
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def http_call(url, payload=None):
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            ok = 200 <= response.status < 300
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def bench_endpoint(url, payload, total, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: http_call(url, payload), range(total)))
+    elapsed = time.perf_counter() - start
+    summary = summarize([duration for duration, _ in results])
+    summary['errors'] = sum(1 for _, ok in results if not ok)
+    summary['throughput_rps'] = total / elapsed if elapsed else None
+    return summary
+
+
+def bench_api(base_url, prefix, args):
+    api = f"{base_url}{prefix}/api"
+    play_text = "Die Lakers haben gestern Abend gewonnen. LeBron James hat 30 Punkte gemacht."
+    return {
+        'articles': bench_endpoint(f"{api}/articles", None, args.requests, args.concurrency),
+        'article_detail': bench_endpoint(f"{api}/article/0", None, args.requests, args.concurrency),
+        'play': bench_endpoint(f"{api}/play", {'text': play_text, 'voice': 'nova'},
+                               max(1, args.requests // 4), args.concurrency),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sources', default='all', help="NEWS_FETCHER value to benchmark (default: all)")
+    parser.add_argument('--chat-latency', type=float, default=0.05, help="Mean chat-completions latency in seconds")
+    parser.add_argument('--tts-latency', type=float, default=0.1, help="Mean TTS latency in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of OpenAI stub calls that fail")
+    parser.add_argument('--dw-articles', type=int, default=10, help="Articles linked from the DW stub topic page")
+    parser.add_argument('--parse-repeat', type=int, default=20, help="Repetitions per parse measurement")
+    parser.add_argument('--requests', type=int, default=400, help="Requests per API endpoint")
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent API clients")
+    parser.add_argument('--output', type=Path, help="Result file (default: bench/results/<timestamp>-<rev>.json)")
+    args = parser.parse_args(argv)
+
+    stubs = {
+        'slamdunk': SlamdunkStub().start(),
+        'dw': DWStub(article_count=args.dw_articles).start(),
+        'openai': OpenAIStub(args.chat_latency, args.tts_latency, args.error_rate).start(),
+    }
+    workdir = Path(tempfile.mkdtemp(prefix='deutschify-bench-'))
+    configure_environment(args, stubs['slamdunk'], stubs['dw'], stubs['openai'], workdir)
+
+    from app.config import settings
+    from app.services.news_fetcher_service import get_news_fetcher
+    import main as app_main
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'parameters': {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        'parse': bench_parsing(get_news_fetcher(), stubs['dw'], args.parse_repeat),
+        'refresh': bench_refresh(get_news_fetcher(), stubs),
+    }
+
+    server, thread, base_url = start_api_server(app_main.app)
+    try:
+        for stub in stubs.values():
+            stub.reset_calls()
+        results['api'] = bench_api(base_url, settings.WEB_APP_PREFIX, args)
+        results['api_upstream_calls'] = {name: dict(stub.calls) for name, stub in stubs.items()}
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+        for stub in stubs.values():
+            stub.stop()
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        output = RESULTS_DIR / f"{stamp}-{results['revision'] or 'unknown'}.json"
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# bench/startup_time.py
+"""
+Cold-start benchmark: how long `import main` takes, and what it pulls in.
+
+Runs `python -X importtime -c "import main"` in fresh interpreters and reports
+the median self/cumulative import time of main, the slowest top-level imports,
+and whether modules that should be deferred until first use (scraping,
+templates, image resizing, the server) were imported eagerly. A second probe
+times building the news fetcher, which happens on startup rather than on import.
+
+Exits with status 1 when the median import time exceeds --budget-ms or a
+deferred module is imported eagerly, so it can guard the budget in CI.
+
+Usage (from the repository root):
+    python -m bench.startup_time --repeat 5 --budget-ms 800
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench.run_benchmarks import RESULTS_DIR, git_revision
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Only needed once a request or a refresh actually uses them
+DEFERRED_MODULES = ('bs4', 'jinja2', 'PIL', 'uvicorn')
+
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+EAGER_PROBE = "import sys, main, json; print(json.dumps(sorted(m for m in %r if m in sys.modules)))" % (DEFERRED_MODULES,)
+FETCHER_PROBE = (
+    "import time; import main; from app.services.news_fetcher_service import get_news_fetcher; "
+    "start = time.perf_counter(); get_news_fetcher(); print(time.perf_counter() - start)"
+)
+
+
+def run_python(args, env):
+    return subprocess.run([sys.executable, *args], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def parse_importtime(stderr, root='main'):
+    """
+    Returns ({module: (self_us, cumulative_us)}, [direct imports of `root`]) from
+    -X importtime output, which lists every module after the modules it imported.
+    """
+    modules = {}
+    children = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = (int(self_us), int(cumulative_us))
+        depth = len(indent) // 2
+        if depth == 0 and name != root:
+            children = []  # Imported under an earlier top-level module, e.g. site
+        elif depth == 1:
+            children.append(name)
+    return modules, children
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument('--top', type=int, default=10, help="Slowest imports to report")
+    parser.add_argument('--budget-ms', type=float, help="Fail if the median import time of main exceeds this")
+    parser.add_argument('--output', type=Path, help="Result file (default: bench/results/<timestamp>-<rev>-startup.json)")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix='deutschify-startup-'))
+    env = dict(os.environ)
+    env.update({
+        'LOG_LEVEL': 'WARNING',
+        'WEB_CONCURRENCY': '1',
+        'IMAGE_CACHE_DIR': str(workdir / 'images'),
+        'BODY_STORE_DIR': str(workdir / 'bodies'),
+    })
+    env.pop('SNAPSHOT_DIR', None)
+
+    runs = [parse_importtime(run_python(['-X', 'importtime', '-c', 'import main'], env).stderr)
+            for _ in range(args.repeat)]
+    cumulative_ms = [modules['main'][1] / 1000 for modules, _ in runs]
+    self_ms = [modules['main'][0] / 1000 for modules, _ in runs]
+
+    # Slowest direct imports of main, by median cumulative time
+    top_level = {}
+    for modules, children in runs:
+        for name in children:
+            top_level.setdefault(name, []).append(modules[name][1] / 1000)
+    slowest = sorted(((name, statistics.median(times)) for name, times in top_level.items()),
+                     key=lambda item: item[1], reverse=True)[:args.top]
+
+    eager = json.loads(run_python(['-c', EAGER_PROBE], env).stdout)
+    fetcher_s = [float(run_python(['-c', FETCHER_PROBE], env).stdout.strip().splitlines()[-1])
+                 for _ in range(args.repeat)]
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'repeat': args.repeat,
+        'import_main_ms': {'median': statistics.median(cumulative_ms), 'min': min(cumulative_ms), 'max': max(cumulative_ms)},
+        'import_main_self_ms': statistics.median(self_ms),
+        'slowest_imports_ms': dict((name, round(ms, 1)) for name, ms in slowest),
+        'eagerly_imported': eager,
+        'build_news_fetcher_ms': statistics.median(fetcher_s) * 1000,
+        'budget_ms': args.budget_ms,
+    }
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        output = RESULTS_DIR / f"{stamp}-{results['revision'] or 'unknown'}-startup.json"
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+    over_budget = args.budget_ms is not None and results['import_main_ms']['median'] > args.budget_ms
+    if over_budget:
+        print(f"Import time {results['import_main_ms']['median']:.0f} ms exceeds the {args.budget_ms:.0f} ms budget",
+              file=sys.stderr)
+    if eager:
+        print(f"Deferred modules imported eagerly: {', '.join(eager)}", file=sys.stderr)
+    if over_budget or eager:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+# bench/stubs.py
+"""
+Local stand-ins for slamdunk.ru, dw.com and the OpenAI chat-completions and TTS
+endpoints, used by the offline benchmark harness.
+
+The Slamdunk stub serves the fixture pages shipped in the repository. The DW stub
+renders topic and article pages in DW's `window.__DW_SPT` format from the
+articles in `news_articles.json`, since no DW page fixture is shipped.
+"""
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+NBA_LIST_FIXTURE = REPO_ROOT / 'Новости НБА.html'
+NBA_DETAIL_FIXTURE = REPO_ROOT / 'detail.html'
+ARTICLES_FIXTURE = REPO_ROOT / 'news_articles.json'
+
+
+class StubServer:
+    """
+    Runs a ThreadingHTTPServer on a free local port in a daemon thread and counts
+    the requests it receives per route.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.calls_lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stub._dispatch(self, 'GET')
+
+            def do_POST(self):
+                stub._dispatch(self, 'POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name=type(self).__name__, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_calls(self):
+        with self.calls_lock:
+            self.calls.clear()
+
+    def count(self, route):
+        with self.calls_lock:
+            self.calls[route] += 1
+
+    def _dispatch(self, request, method):
+        try:
+            status, content_type, body = self.handle(request, method)
+        except Exception as e:
+            status, content_type, body = 500, 'text/plain', str(e).encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def handle(self, request, method):
+        raise NotImplementedError
+
+
+class SlamdunkStub(StubServer):
+    """
+    Serves the saved Slamdunk NBA list page at /news/nba/ and the saved article page everywhere else.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.list_page = NBA_LIST_FIXTURE.read_bytes()
+        self.detail_page = NBA_DETAIL_FIXTURE.read_bytes()
+
+    @property
+    def news_url(self):
+        return self.url + '/news/nba/'
+
+    def handle(self, request, method):
+        if request.path.rstrip('/') == '/news/nba':
+            self.count('list')
+            return 200, 'text/html; charset=utf-8', self.list_page
+        self.count('detail')
+        return 200, 'text/html; charset=utf-8', self.detail_page
+
+
+class DWStub(StubServer):
+    """
+    Serves a DW topic page linking `article_count` articles, and the article pages themselves.
+    """
+
+    def __init__(self, article_count=10):
+        super().__init__()
+        fixtures = json.loads(ARTICLES_FIXTURE.read_text(encoding='utf-8'))
+        self.articles = {}
+        for i in range(article_count):
+            fixture = fixtures[i % len(fixtures)]
+            paragraphs = [p.strip() for p in fixture['adapted_teaser'].split('\n') if p.strip()]
+            self.articles[f"/de/nachrichten/artikel-{i}/a-{70000000 + i}"] = {
+                'title': fixture['adapted_title'],
+                'teaser': paragraphs[0] if paragraphs else '',
+                'body': ''.join(f"<p>{p}</p>" for p in paragraphs * 4),
+                'image_url': fixture['image_url'],
+                'date': f"2024-11-{1 + i % 28:02d}T12:00:00.000Z",
+            }
+
+    @property
+    def news_url(self):
+        return self.url + '/de/themen/s-9077'
+
+    def handle(self, request, method):
+        if request.path == '/de/themen/s-9077':
+            self.count('list')
+            links = ''.join(f'<a href="{path}">{article["title"]}</a>' for path, article in self.articles.items())
+            return 200, 'text/html; charset=utf-8', f"<html><body>{links}</body></html>".encode('utf-8')
+        article = self.articles.get(request.path)
+        if article is None:
+            return 404, 'text/plain', b'not found'
+        self.count('detail')
+        state = json.dumps({'data': {'article': article}}, ensure_ascii=False)
+        page = f"<html><head><script>window.__DW_SPT = {state};</script></head><body></body></html>"
+        return 200, 'text/html; charset=utf-8', page.encode('utf-8')
+
+
+class OpenAIStub(StubServer):
+    """
+    Chat-completions and TTS stand-in with configurable latency and error rate.
+
+    Latencies are uniformly jittered by +/-50% around the configured mean. Chat
+    responses echo the tail of the prompt; speech responses are a fake MP3 body
+    whose size grows with the input text.
+    """
+
+    def __init__(self, chat_latency=0.0, tts_latency=0.0, error_rate=0.0, seed=0):
+        super().__init__()
+        self.chat_latency = chat_latency
+        self.tts_latency = tts_latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+
+    def _sleep_and_roll(self, latency):
+        with self.random_lock:
+            delay = latency * self.random.uniform(0.5, 1.5) if latency else 0
+            failed = self.random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return failed
+
+    def handle(self, request, method):
+        length = int(request.headers.get('Content-Length') or 0)
+        payload = json.loads(request.rfile.read(length) or b'{}')
+
+        if request.path.endswith('/chat/completions'):
+            self.count('chat')
+            if self._sleep_and_roll(self.chat_latency):
+                self.count('chat_error')
+                return 500, 'application/json', b'{"error": {"message": "stub failure"}}'
+            prompt = payload['messages'][-1]['content']
+            answer = prompt.rsplit('\n\n', 1)[-1][-400:]
+            body = {'choices': [{'message': {'role': 'assistant', 'content': answer}}]}
+            return 200, 'application/json', json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+        if request.path.endswith('/audio/speech'):
+            self.count('tts')
+            if self._sleep_and_roll(self.tts_latency):
+                self.count('tts_error')
+                return 500, 'application/json', b'{"error": {"message": "stub failure"}}'
+            text = payload.get('input', '')
+            return 200, 'audio/mpeg', b'ID3' + b'\x00' * (len(text.encode('utf-8')) * 40)
+
+        return 404, 'text/plain', b'not found'
@@ -1,17 +1,21 @@
 # app/main.py
 
-import uvicorn
+import asyncio
 from fastapi import FastAPI, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.utils.logger import get_logger
-from apscheduler.schedulers.background import BackgroundScheduler
-from app.api.routes import router as api_router
-from app.services.news_fetcher_service import news_fetcher  # Import the news_fetcher instance
-import pytz  # Import pytz
+from app.utils.logger import get_logger, request_id_var
+from app.utils import metrics
+from app.api.routes import router as api_router, get_image_cache
+from app.services.news_fetcher_service import get_news_fetcher
+from app.services.refresh_coordinator import get_refresh_coordinator
+from app.services.refresh_scheduler import start_refresh_scheduler, get_refresh_scheduler
+import time
+import uuid
 
 logger = get_logger(__name__)
 
@@ -29,11 +33,58 @@ app.add_middleware(
     allow_headers=["*"],             # Allows all headers
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (e.g. /app/api/article/{article_id}) to keep cardinality bounded
+        route = request.scope.get('route')
+        route_path = getattr(route, 'path', None) or 'unmatched'
+        metrics.REQUEST_LATENCY.observe(time.perf_counter() - start,
+                                        method=request.method, route=route_path, status=status)
+
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    # Correlation ID for every log line written while handling this request
+    request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+        response.headers['X-Request-ID'] = request_id
+        return response
+    finally:
+        request_id_var.reset(token)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Initialize APScheduler with pytz timezone
-scheduler = BackgroundScheduler(timezone=pytz.utc)  # You can specify any timezone you prefer
+# Created on startup, since building the fetcher loads the cached articles.
+refresh_coordinator = None
+
+def is_refresh_leader():
+    return refresh_coordinator is not None and refresh_coordinator.is_leader
+
+def follow_leader():
+    # Must run on the event loop
+    loop = asyncio.get_running_loop()
+    refresh_coordinator.watch(settings.SNAPSHOT_POLL_SECONDS,
+                              on_promoted=lambda: loop.call_soon_threadsafe(start_leader_scheduler))
+    logger.info("Following the refresh leader through the snapshot store.")
+
+def start_leader_scheduler():
+    # Must run on the event loop
+    if not refresh_coordinator.confirm_leadership():
+        follow_leader()
+        return
+    scheduler = start_refresh_scheduler(get_news_fetcher(), refresh_coordinator.refresh_jobs())
+    scheduler.add_periodic(refresh_coordinator.sync, settings.SNAPSHOT_POLL_SECONDS)
+    logger.info("Scheduler started on the refresh leader.")
+
 @app.on_event("startup")
 async def startup_event():
     # # Run the bot in a separate thread
@@ -41,21 +92,33 @@ async def startup_event():
     # bot_thread.start()
     # logger.info("Telegram bot started.")
 
-    # Start the scheduler
-    scheduler.add_job(news_fetcher.update_articles, 'interval', hours=5)
-    scheduler.start()
-    logger.info("Scheduler started for news fetching.")
+    global refresh_coordinator
+    news_fetcher = await run_in_threadpool(get_news_fetcher)
+    refresh_coordinator = get_refresh_coordinator(news_fetcher)
 
-    # Fetch news articles at startup
-    news_fetcher.update_articles()
+    # Only the elected leader owns the scheduler; every other instance or worker
+    # just watches the snapshot store and hot-swaps new versions. On startup the
+    # leader fetches the sources with nothing cached before serving.
+    await run_in_threadpool(refresh_coordinator.start)
+    if settings.IMAGE_PREFETCH:
+        # Subscribes to snapshots so the refresh leader fetches new images ahead of requests
+        get_image_cache(prefetch=is_refresh_leader)
+    if refresh_coordinator.is_leader:
+        start_leader_scheduler()
+    else:
+        follow_leader()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     # logger.info("Stopping Telegram bot.")
     # telegram_bot.stop()
 
-    logger.info("Shutting down scheduler.")
-    scheduler.shutdown()
+    scheduler = get_refresh_scheduler()
+    if scheduler is not None:
+        logger.info("Shutting down scheduler.")
+        scheduler.stop()
+    if refresh_coordinator is not None:
+        refresh_coordinator.stop()
 
 # Define a root route
 @app.get("/", response_class=RedirectResponse)
@@ -63,5 +126,15 @@ async def root():
     # Redirect to the main app prefix
     return RedirectResponse(url=settings.WEB_APP_PREFIX + "/")
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    # Prometheus text exposition format
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=settings.PORT, reload=True)
\ No newline at end of file
+    import uvicorn
+    if settings.WORKERS > 1:
+        # reload and workers are mutually exclusive in uvicorn
+        uvicorn.run("main:app", host="0.0.0.0", port=settings.PORT, workers=settings.WORKERS)
+    else:
+        uvicorn.run("main:app", host="0.0.0.0", port=settings.PORT, reload=True)
\ No newline at end of file
@@ -0,0 +1,95 @@
+# tests/test_article_changes.py
+
+import random
+
+from app.models.NewsArticle import NewsArticle
+from app.services.article_changes import ChangeLog
+
+
+def article(number, title=None):
+    return NewsArticle.from_dict({
+        'url': f"https://example.com/{number}",
+        'title': title or f"Artikel {number}",
+        'published_date': '2024-05-01',
+        'source': 'dw',
+    })
+
+
+def rebuild(old_urls, articles, changes):
+    """
+    What a client does with a delta: place the sent articles at their ids and fill
+    the other slots with the remaining old articles, keeping their old order.
+    """
+    placed = {index: articles[index].url for index in changes['added'] + changes['updated']}
+    placed.update({article_id: url for url, article_id in changes['moved'].items()})
+    dropped = set(changes['removed']) | set(placed.values())
+    remaining = iter(url for url in old_urls if url not in dropped)
+    return [placed[index] if index in placed else next(remaining) for index in range(len(articles))]
+
+
+def test_new_article_on_top_does_not_move_the_others():
+    change_log = ChangeLog(history=5)
+    old = [article(number) for number in range(48)]
+    since = change_log.version(None, old)
+    new = [article(100)] + old[:-1]
+
+    _, changes = change_log.changes(None, new, since)
+
+    assert changes == {'added': [0], 'updated': [], 'removed': [old[-1].url], 'moved': {}}
+
+
+def test_updated_and_reordered_articles():
+    change_log = ChangeLog(history=5)
+    old = [article(number) for number in range(5)]
+    since = change_log.version(None, old)
+    new = [old[3], old[0], article(1, title="Neuer Titel"), old[2], old[4]]
+
+    _, changes = change_log.changes(None, new, since)
+
+    assert changes['updated'] == [2]
+    assert changes['moved'] == {old[3].url: 0}
+    assert rebuild([a.url for a in old], new, changes) == [a.url for a in new]
+
+
+def test_rebuild_matches_random_edits():
+    rng = random.Random(7)
+    change_log = ChangeLog(history=50)
+    old = [article(number) for number in range(30)]
+    for step in range(40):
+        since = change_log.version(None, old)
+        new = [a for a in old if rng.random() > 0.1]
+        for number in range(rng.randint(0, 3)):
+            new.insert(rng.randint(0, len(new)), article(1000 + step * 10 + number))
+        if len(new) > 1 and rng.random() < 0.5:
+            i, j = rng.sample(range(len(new)), 2)
+            new[i], new[j] = new[j], new[i]
+        if new and rng.random() < 0.5:
+            index = rng.randrange(len(new))
+            new[index] = new[index].replace(title=f"Update {step}")
+
+        _, changes = change_log.changes(None, new, since)
+
+        assert rebuild([a.url for a in old], new, changes) == [a.url for a in new]
+        old = new
+
+
+def test_same_content_has_the_same_version_and_unknown_versions_resync():
+    first, second = ChangeLog(), ChangeLog()
+    articles = [article(number) for number in range(3)]
+
+    assert first.version(None, articles) == second.version(None, list(articles))
+    assert first.changes(None, articles, since=12345)[1] is None
+
+
+def test_learning_content_is_not_listed_or_an_update():
+    change_log = ChangeLog(history=5)
+    old = [article(number) for number in range(3)]
+    since = change_log.version(None, old)
+    learning = {'A1': {'vocabulary': [], 'questions': [], 'text_hash': 'abc'}}
+    new = [old[0].replace(learning=learning)] + old[1:]
+
+    _, changes = change_log.changes(None, new, since)
+
+    assert 'learning' not in new[0].to_api_dict()
+    assert new[0].to_dict()['learning'] == learning
+    assert changes == {'added': [], 'updated': [], 'removed': [], 'moved': {}}
@@ -0,0 +1,21 @@
+# tests/test_composite_news_fetcher.py
+
+import heapq
+
+from app.services.composite_news_fetcher import _published_key, published_timestamp
+
+
+def test_dates_and_timestamps_merge_by_time():
+    nba = [{'url': 'nba-2', 'published_date': '2024-05-02'}, {'url': 'nba-1', 'published_date': '2024-05-01'}]
+    dw = [{'url': 'dw-2', 'published_date': '2024-05-02T09:15:00.000Z'},
+          {'url': 'dw-1', 'published_date': '2024-05-01T23:30:00+02:00'},
+          {'url': 'dw-0', 'published_date': ''}]
+
+    merged = heapq.merge(nba, dw, key=_published_key, reverse=True)
+
+    assert [article['url'] for article in merged] == ['dw-2', 'nba-2', 'dw-1', 'nba-1', 'dw-0']
+
+
+def test_unparseable_dates_sort_last():
+    assert published_timestamp('gestern') == published_timestamp(None) == 0.0
+    assert published_timestamp('2024-05-01') == published_timestamp('2024-05-01T00:00:00Z')
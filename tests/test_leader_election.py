@@ -0,0 +1,50 @@
+# tests/test_leader_election.py
+
+import time
+
+from app.services.leader_election import FileLease, SqliteLease
+
+
+def test_sqlite_lease_is_exclusive_and_renewable(tmp_path):
+    first = SqliteLease(tmp_path / 'leader.sqlite', ttl=60, holder_id='first')
+    second = SqliteLease(tmp_path / 'leader.sqlite', ttl=60, holder_id='second')
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.acquire()  # Renewal by the holder
+
+
+def test_sqlite_lease_expires_without_renewal(tmp_path):
+    first = SqliteLease(tmp_path / 'leader.sqlite', ttl=0.2, holder_id='first')
+    second = SqliteLease(tmp_path / 'leader.sqlite', ttl=0.2, holder_id='second')
+    assert first.acquire()
+
+    time.sleep(0.3)
+
+    assert second.acquire()
+    assert not first.acquire()
+
+
+def test_sqlite_lease_release_hands_over(tmp_path):
+    first = SqliteLease(tmp_path / 'leader.sqlite', ttl=60, holder_id='first')
+    second = SqliteLease(tmp_path / 'leader.sqlite', ttl=60, holder_id='second')
+    assert first.acquire()
+
+    second.release()  # Not the holder: no effect
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+
+
+def test_file_lease_is_held_until_released(tmp_path):
+    first = FileLease(tmp_path / 'scheduler.lock', holder_id='first')
+    second = FileLease(tmp_path / 'scheduler.lock', holder_id='second')
+
+    assert first.acquire()
+    assert first.acquire()
+    assert not second.acquire()
+    assert (tmp_path / 'scheduler.lock').read_text() == 'first'
+
+    first.release()
+    assert second.acquire()
+    second.release()
@@ -0,0 +1,24 @@
+# tests/test_learning_content.py
+
+from app.services.learning_content import parse_vocabulary
+
+
+def test_parse_vocabulary_with_separators():
+    entries = parse_vocabulary("1. das Spiel – the game\n2. gewinnen: to win")
+    assert entries == [
+        {'article': 'das', 'lemma': 'Spiel', 'translation': 'the game'},
+        {'article': None, 'lemma': 'gewinnen', 'translation': 'to win'},
+    ]
+
+
+def test_parse_vocabulary_with_parenthesised_translation():
+    entries = parse_vocabulary("1. die Mannschaft (the team)\n2. **der Sieg** (victory)\n- gewinnen (to win)")
+    assert entries == [
+        {'article': 'die', 'lemma': 'Mannschaft', 'translation': 'the team'},
+        {'article': 'der', 'lemma': 'Sieg', 'translation': 'victory'},
+        {'article': None, 'lemma': 'gewinnen', 'translation': 'to win'},
+    ]
+
+
+def test_parse_vocabulary_skips_lines_without_translation():
+    assert parse_vocabulary("Vokabeln:\ndie Mannschaft\n(Anmerkung)") == []
@@ -0,0 +1,21 @@
+# tests/test_metrics.py
+
+from app.utils.metrics import Counter, Gauge
+
+
+def test_unlabelled_metrics_start_at_zero():
+    counter = Counter('test_refreshes_total', 'Refreshes.')
+    gauge = Gauge('test_streams_in_flight', 'Streams.')
+
+    assert counter.render().splitlines()[-1] == 'test_refreshes_total 0.0'
+    assert gauge.render().splitlines()[-1] == 'test_streams_in_flight 0.0'
+    counter.inc()
+    assert counter.render().splitlines()[-1] == 'test_refreshes_total 1.0'
+
+
+def test_labelled_metrics_have_no_samples_until_used():
+    counter = Counter('test_fetches_total', 'Fetches.', ['source'])
+
+    assert counter.render().splitlines()[2:] == []
+    counter.inc(source='dw')
+    assert counter.render().splitlines()[-1] == 'test_fetches_total{source="dw"} 1.0'
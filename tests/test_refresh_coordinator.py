@@ -0,0 +1,137 @@
+# tests/test_refresh_coordinator.py
+
+import time
+
+import pytest
+
+from app.services.leader_election import SqliteLease
+from app.services.refresh_coordinator import RefreshCoordinator
+from app.services.snapshot_store import MmapSnapshotStore, SnapshotStore
+
+
+class FakeFetcher:
+    """
+    Single-source stand-in for a NewsFetcher, serving plain article dicts.
+    """
+
+    source_name = 'dw'
+
+    def __init__(self, articles=None, fetched=None):
+        self.cached_articles = list(articles or [])
+        self.fetched = fetched or [{'url': 'https://example.com/fresh', 'title': 'Frisch'}]
+        self.updates = 0
+        self.refresh_on_read = True
+
+    def set_refresh_on_read(self, enabled):
+        self.refresh_on_read = enabled
+
+    def source_fetchers(self):
+        return {self.source_name: self}
+
+    def update_articles(self):
+        self.updates += 1
+        self.cached_articles = list(self.fetched)
+
+    def refresh_jobs(self):
+        return [(self.source_name, self.update_articles, 1)]
+
+    def export_snapshot(self):
+        return list(self.cached_articles)
+
+    def install_snapshot(self, snapshot):
+        self.cached_articles = list(snapshot)
+
+
+def coordinator(tmp_path, name, fetcher, ttl=60):
+    lease = SqliteLease(tmp_path / 'leader.sqlite', ttl=ttl, holder_id=name)
+    return RefreshCoordinator(fetcher, SnapshotStore(tmp_path / 'snapshots'), lease)
+
+
+@pytest.mark.parametrize('store_class', [SnapshotStore, MmapSnapshotStore])
+def test_snapshot_store_round_trip(tmp_path, store_class):
+    store = store_class(tmp_path, keep=2)
+    assert store.load() == (0, None)
+
+    versions = [store.publish({'dw': [{'url': f"https://example.com/{number}"}]}) for number in range(3)]
+
+    assert versions == sorted(set(versions))
+    assert store.load() == (versions[-1], {'dw': [{'url': 'https://example.com/2'}]})
+    assert store.versions() == versions[-2:]
+    assert store_class(tmp_path).latest_version() == versions[-1]  # Seen by another worker
+
+
+def test_leader_publishes_cache_and_follower_installs_it(tmp_path):
+    cached = [{'url': 'https://example.com/cached', 'title': 'Gespeichert'}]
+    leader_fetcher, follower_fetcher = FakeFetcher(cached), FakeFetcher()
+    leader = coordinator(tmp_path, 'leader', leader_fetcher)
+    follower = coordinator(tmp_path, 'follower', follower_fetcher)
+
+    leader.start()
+    follower.start()
+
+    assert leader.is_leader and not follower.is_leader
+    assert leader_fetcher.updates == 0  # Nothing to scrape: the cache was published as is
+    assert follower_fetcher.updates == 0
+    assert follower_fetcher.cached_articles == cached
+    assert follower.version == leader.version > 0
+    assert not leader_fetcher.refresh_on_read and not follower_fetcher.refresh_on_read
+
+
+def test_leader_refreshes_empty_sources_on_a_new_store(tmp_path):
+    fetcher = FakeFetcher()
+    leader = coordinator(tmp_path, 'leader', fetcher)
+
+    leader.start()
+
+    assert fetcher.updates == 1
+    assert leader.store.load() == (leader.version, fetcher.fetched)
+
+
+def test_follower_is_promoted_when_the_lease_expires(tmp_path):
+    leader = coordinator(tmp_path, 'leader', FakeFetcher([{'url': 'https://example.com/a'}]), ttl=0.2)
+    follower = coordinator(tmp_path, 'follower', FakeFetcher(), ttl=0.2)
+    leader.start()
+    follower.start()
+    assert not follower.is_leader
+
+    time.sleep(0.3)
+    follower.sync()
+
+    assert follower.is_leader
+    assert not leader.confirm_leadership()
+    assert not leader.is_leader
+
+
+def test_leader_job_runs_only_on_the_leader_and_publishes(tmp_path):
+    leader = coordinator(tmp_path, 'leader', FakeFetcher([{'url': 'https://example.com/a'}]))
+    follower = coordinator(tmp_path, 'follower', FakeFetcher())
+    leader.start()
+    follower.start()
+    started = leader.version
+
+    [(_, follower_job, _)] = follower.refresh_jobs()
+    [(_, leader_job, _)] = leader.refresh_jobs()
+
+    assert follower_job() is False
+    assert follower.news_fetcher.updates == 0
+    assert leader_job() is True
+    assert leader.version > started
+    follower.sync()
+    assert follower.news_fetcher.cached_articles == leader.news_fetcher.fetched
+
+
+def test_leader_steps_down_when_it_loses_the_lease_mid_refresh(tmp_path):
+    fetcher = FakeFetcher([{'url': 'https://example.com/a'}])
+    leader = coordinator(tmp_path, 'leader', fetcher, ttl=60)
+    leader.start()
+    started = leader.version
+    rival = SqliteLease(tmp_path / 'leader.sqlite', ttl=60, holder_id='rival')
+
+    def refresh_and_lose_the_lease():
+        fetcher.update_articles()
+        leader.lease.release()
+        assert rival.acquire()
+
+    assert leader.leader_job(refresh_and_lose_the_lease)() is False
+    assert not leader.is_leader
+    assert leader.store.latest_version() == started  # The stale refresh was not published
@@ -0,0 +1,35 @@
+# tests/test_templates.py
+
+from jinja2 import Environment, FileSystemLoader
+
+from app.api.routes import template_article
+from app.models.NewsArticle import NewsArticle
+
+# DW articles are adapted as a whole body: they have no adapted title or teaser
+DW_ARTICLE = NewsArticle.from_dict({
+    'title': 'Bundestag beschließt Haushalt',
+    'published_date': '2024-05-01',
+    'teaser': 'Der Bundestag hat den Haushalt beschlossen.',
+    'text': 'Der Bundestag hat am Freitag den Haushalt beschlossen.',
+    'url': 'https://www.dw.com/de/haushalt/a-1',
+    'adapted_texts': {'A1': 'Der Bundestag sagt ja zum Haushalt.'},
+    'source': 'dw',
+})
+
+
+def render(name, **context):
+    environment = Environment(loader=FileSystemLoader('app/api/templates'), autoescape=True)
+    environment.globals['url_for'] = lambda route, **params: f"/{route}"
+    return environment.get_template(name).render(request=None, **context)
+
+
+def test_index_renders_article_without_adapted_fields():
+    html = render('news.html', articles=enumerate([template_article(DW_ARTICLE)]))
+    assert 'None' not in html
+    assert '2024-05-01' in html
+
+
+def test_detail_renders_article_without_adapted_fields():
+    html = render('news_detail.html', article=template_article(DW_ARTICLE), formatted_adapted_text='', article_id=0)
+    assert 'None' not in html
+    assert '2024-05-01' in html